@@ -9,22 +9,67 @@
 # permitindo análise detalhada do comportamento e integração com benchmarks e gráficos.
 '''
 
-from ga.ga_core import GeneticAlgorithm  # Importa o núcleo do algoritmo genético
-from ga.individual import Individual     # Importa a classe de indivíduo
-import numpy as np
+from ga.ga_core import GeneticAlgorithm, ArrayGeneticAlgorithm  # Importa o núcleo do algoritmo genético
+from ga.island import IslandGeneticAlgorithm  # Modelo de ilhas (subpopulações em processos)
+from ga.seeding import python_rng, numpy_rng  # Geradores a partir da SeedSequence da execução
 
 class GeneticAgent:
-    def __init__(self, world, population_size=100, gens=500, chrom_length=100, mutation_rate=0.02, crossover_rate=0.8):
+    def __init__(self, world, population_size=100, gens=500, chrom_length=100, mutation_rate=0.02, crossover_rate=0.8,
+                 vectorized=False, n_workers=1, executor='process', stagnation_window=None,
+                 target_fitness=None, max_evaluations=None, time_budget=None,
+                 islands=1, migration_interval=10, migration_size=2, save_path=None, save_interval=10,
+                 resume_from=None, diversity_every=1, history_max_rows=None, history_dir=None,
+                 profile_phases=False, memory_profile_every=None, memory_report_path=None,
+                 seed_seq=None, kernel=False, warm_start_dir=None, warm_start_fraction=1.0):
         # Referência ao ambiente (mundo do Wumpus)
         self.world = world
-        # Instancia o algoritmo genético com parâmetros de população, gerações e tamanho do cromossomo
-        self.ga = GeneticAlgorithm(
+        # Parâmetros de população, gerações e tamanho do cromossomo
+        ga_params = dict(
             pop_size=population_size,
             gens=gens,
             chrom_length=chrom_length,
             mutation_rate=mutation_rate,
-            crossover_rate=crossover_rate
+            crossover_rate=crossover_rate,
+            n_workers=n_workers,  # n_workers > 1 avalia o fitness em paralelo (ver ga/parallel_eval.py)
+            executor=executor,
+            # Critérios de parada antecipada (None = executa todas as gerações)
+            stagnation_window=stagnation_window,
+            target_fitness=target_fitness,
+            max_evaluations=max_evaluations,
+            time_budget=time_budget,
+            # Diversidade por posição amostrada a cada diversity_every gerações (0 desativa)
+            diversity_every=diversity_every,
+            # Históricos limitados em RAM (history_max_rows) e gravados em .npy (history_dir)
+            history_max_rows=history_max_rows,
+            history_dir=history_dir,
+            # Tempo por fase de cada geração (avaliação, ordenação, seleção, ...)
+            profile_phases=profile_phases,
+            # Perfil de memória (tracemalloc) a cada memory_profile_every gerações
+            memory_profile_every=memory_profile_every,
+            memory_report_path=memory_report_path,
+            # Avaliação com o kernel de simulação (compilado com Numba, se instalado)
+            kernel=kernel
             )
+        # Checkpoint em disco para execuções longas e warm start a partir de populações
+        # salvas (não suportados no modelo de ilhas: IslandGeneticAlgorithm levanta ValueError)
+        if islands > 1 and resume_from is not None:
+            raise ValueError("resume_from não é suportado com o modelo de ilhas (islands > 1)")
+        self.resume_from = resume_from
+        ga_params.update(save_path=save_path, warm_start_dir=warm_start_dir)
+        if islands <= 1:
+            ga_params.update(save_interval=save_interval, warm_start_fraction=warm_start_fraction)
+        # seed_seq: SeedSequence da execução (ver ga/seeding.py); torna o GA reproduzível
+        # independentemente do worker e da ordem em que as execuções rodam
+        if islands > 1:
+            # Modelo de ilhas: uma subpopulação de population_size por processo, com migração
+            self.ga = IslandGeneticAlgorithm(islands, migration_interval, migration_size,
+                                             vectorized=vectorized, seed=seed_seq, **ga_params)
+        else:
+            # vectorized=True usa a população em matriz NumPy (ArrayGeneticAlgorithm)
+            ga_cls = ArrayGeneticAlgorithm if vectorized else GeneticAlgorithm
+            if seed_seq is not None:
+                ga_params['rng'] = numpy_rng(seed_seq) if vectorized else python_rng(seed_seq)
+            self.ga = ga_cls(**ga_params)
         # Histórico das ações e percepções do agente
         self.history = []
 
@@ -33,7 +78,10 @@ class GeneticAgent:
         Executa o algoritmo genético para encontrar a melhor sequência de ações.
         """
         # Executa o algoritmo genético e obtém o melhor indivíduo (sequência de ações)
-        ga_results = self.ga.run(self.world)
+        if self.resume_from is not None:
+            ga_results = self.ga.run(self.world, resume_from=self.resume_from)
+        else:
+            ga_results = self.ga.run(self.world)
         best = ga_results["best"]
         print("\n🧬 Melhor sequência encontrada pelo algoritmo genético:")
         print(best.chromosome, "\n")
@@ -61,7 +109,7 @@ class GeneticAgent:
         
         # Salva dados de fitness médio e final
         mean_fitness_per_gen = [gen_stats['mean'] for gen_stats in ga_results['fitness_history']]
-        final_fitness_dist = ga_results['fitness_pop'][-1] if ga_results['fitness_pop'] else []
+        final_fitness_dist = ga_results['fitness_final']
         
         # Mapeia ações para números para que o PCA possa processar os dados
         ACTION_MAP = {action: i for i, action in enumerate(['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO'])}
@@ -72,12 +120,16 @@ class GeneticAgent:
 
         dados_extra_formatado = {
             "fitness": mean_fitness_per_gen,
-            "fitness_pop": np.array(ga_results["fitness_pop"]),
+            "fitness_pop": ga_results["fitness_pop"],
+            "fitness_pop_geracoes": ga_results.get("fitness_pop_geracoes"),
             "fitness_final": final_fitness_dist,
             "pop_final": final_pop_numeric,
             "memoria": ga_results.get("memoria", []),
             "cpu": ga_results.get("cpu", []),
-            "diversidade_vars": ga_results.get("diversidade_vars")
+            "tempos": ga_results.get("tempos"),
+            "diversidade_vars": ga_results.get("diversidade_vars"),
+            "diversidade_geracoes": ga_results.get("diversidade_geracoes"),
+            "entropia_vars": ga_results.get("entropia_vars")
         }
 
         # Retorna o histórico de ações e os dados extras
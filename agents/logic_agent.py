@@ -16,7 +16,7 @@ class LogicAgent:
         # Referência ao ambiente (mundo do Wumpus)
         self.world = world
         # Base de conhecimento lógica para inferências
-        self.knowledge = LogicKnowledgeBase()
+        self.knowledge = LogicKnowledgeBase(world.size)
         # Histórico das percepções do agente a cada passo
         self.perception_history = []
         self.logger = None  # Será injetado pelo main
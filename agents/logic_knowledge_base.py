@@ -6,53 +6,208 @@
 # a base de conhecimento lógica do agente simbólico no Wumpus World. Ela armazena percepções,
 # estados conhecidos do ambiente e permite inferir ações seguras a partir das informações coletadas.
 # Serve como núcleo de raciocínio lógico para o LogicAgent, facilitando decisões baseadas em regras.
+# O conhecimento sobre as células fica em bitsets (inteiros Python, um bit por célula):
+# visitadas, possíveis poços, possíveis posições do Wumpus, poços conhecidos e células
+# comprovadamente seguras. Cada percepção nova atualiza só as células vizinhas e as
+# restrições de brisa afetadas (propagação incremental), sem recalcular o mundo inteiro.
+# A navegação usa caminhos mais curtos pelas células seguras (SafePathPlanner): o agente
+# escolhe um alvo só quando aprende algo novo ou o alcança, e segue o caminho em cache.
 '''
 
+from agents.safe_path_planner import SafePathPlanner
+
+# Movimentos: ação → deslocamento (dx, dy), na ordem de preferência
+MOVIMENTOS = (('CIMA', -1, 0), ('BAIXO', 1, 0), ('ESQUERDA', 0, -1), ('DIREITA', 0, 1))
+
+
+def _bits(mascara):
+    # Índices dos bits ligados de um bitset
+    while mascara:
+        menor = mascara & -mascara
+        yield menor.bit_length() - 1
+        mascara ^= menor
+
+
 class LogicKnowledgeBase:
-    def __init__(self):
+    def __init__(self, size):
+        """
+        :param size: Tamanho do mundo (size x size); a célula (x, y) é o bit x * size + y
+        """
+        self.size = size
         self.perceptions = []
-        self.known = {}  # (x, y) → {'safe': bool, 'visited': bool, 'perceptions': []}
+        self.known = {}  # (x, y) → {'seguro': bool, 'visitado': bool, 'percepções': []}
         self.current_pos = (0, 0)
 
+        n = size * size
+        # Vizinhos de cada célula: lista de (ação, índice) e bitset
+        self._adjacentes = []
+        self._vizinhanca = []
+        for i in range(n):
+            x, y = divmod(i, size)
+            adjacentes = [(acao, (x + dx) * size + y + dy) for acao, dx, dy in MOVIMENTOS
+                          if 0 <= x + dx < size and 0 <= y + dy < size]
+            self._adjacentes.append(adjacentes)
+            mascara = 0
+            for _, j in adjacentes:
+                mascara |= 1 << j
+            self._vizinhanca.append(mascara)
+
+        todas = (1 << n) - 1
+        self.visitado = 0
+        self.fronteira = 0  # Células não visitadas vizinhas de uma visitada
+        # A célula inicial é segura; qualquer outra pode ter um poço ou o Wumpus até prova em contrário
+        self.possivel_poco = todas & ~1
+        self.possivel_wumpus = todas & ~1
+        self.poco = 0  # Poços deduzidos
+        self.seguro = 1
+        self.wumpus_vivo = True
+        self.wumpus = None  # Índice da célula do Wumpus, quando deduzida
+        # Células visitadas com brisa cujo poço ainda não foi identificado
+        self.brisas = set()
+        # Caminhos pelas células seguras e alvo atual da navegação
+        self.planner = SafePathPlanner(self._adjacentes, self.seguro)
+        self.alvo = None
+
+    def index(self, pos):
+        return pos[0] * self.size + pos[1]
+
     def update_knowledge(self, perception):
+        """
+        Registra a percepção da célula atual. Só a primeira visita acrescenta restrições
+        (a brisa não muda e o fedor deixa de importar depois que o Wumpus morre).
+        """
         x, y = self.current_pos
+        i = self.index(self.current_pos)
+        self.perceptions.append((x, y, perception))
+        if self.visitado >> i & 1:
+            return
         self.known[(x, y)] = {
             'seguro': 'BRISA' not in perception and 'FEDOR' not in perception,
             'visitado': True,
             'percepções': perception
         }
-        self.perceptions.append((x, y, perception))
+        self.visitado |= 1 << i
+        vizinhos = self._vizinhanca[i]
+        self.fronteira = (self.fronteira | vizinhos) & ~self.visitado
+
+        # O agente sobreviveu à entrada: a célula não tem poço nem o Wumpus vivo
+        # (as brisas vizinhas que a tinham como candidata são reavaliadas)
+        if self.wumpus_vivo:
+            self.possivel_wumpus &= ~(1 << i)
+        self._descartar_pocos(self.possivel_poco & (1 << i))
+        self._atualizar_seguros(1 << i)
+
+        # Brisa: pelo menos um vizinho tem poço; sem brisa, nenhum vizinho tem
+        if 'BRISA' in perception:
+            self.brisas.add(i)
+            self._verificar_brisas((i,))
+        else:
+            self._descartar_pocos(vizinhos & self.possivel_poco)
+
+        # Fedor: o Wumpus (único) está em um dos vizinhos; sem fedor, em nenhum deles
+        if self.wumpus_vivo:
+            antes = self.possivel_wumpus
+            if 'FEDOR' in perception:
+                self.possivel_wumpus &= vizinhos
+            else:
+                self.possivel_wumpus &= ~vizinhos
+            self._atualizar_seguros(antes & ~self.possivel_wumpus)
+            if self.possivel_wumpus and self.possivel_wumpus & (self.possivel_wumpus - 1) == 0:
+                self.wumpus = self.possivel_wumpus.bit_length() - 1
+
+    def _descartar_pocos(self, mascara):
+        # As células de mascara não têm poço: atualiza as seguras e reavalia as brisas vizinhas
+        if not mascara:
+            return
+        self.possivel_poco &= ~mascara
+        self._atualizar_seguros(mascara)
+        afetadas = set()
+        for j in _bits(mascara):
+            afetadas.update(b for b in _bits(self._vizinhanca[j] & self.visitado) if b in self.brisas)
+        self._verificar_brisas(afetadas)
+
+    def _verificar_brisas(self, brisas):
+        # Uma brisa com um único candidato identifica o poço; com um poço conhecido fica satisfeita
+        for b in brisas:
+            candidatos = self._vizinhanca[b] & self.possivel_poco
+            if candidatos & self.poco:
+                self.brisas.discard(b)
+            elif candidatos and candidatos & (candidatos - 1) == 0:
+                self.poco |= candidatos
+                self.brisas.discard(b)
+
+    def _atualizar_seguros(self, mascara):
+        # Reavalia apenas as células de mascara (as que perderam uma possibilidade de perigo)
+        perigo = self.possivel_poco | (self.possivel_wumpus if self.wumpus_vivo else 0)
+        novas = mascara & ~perigo & ~self.seguro
+        if novas:
+            self.seguro |= novas
+            self.planner.add_safe(novas)
+
+    def wumpus_killed(self):
+        """
+        Registra a morte do Wumpus: as células que só eram perigosas por ele passam a ser seguras.
+        """
+        if not self.wumpus_vivo:
+            return
+        self.wumpus_vivo = False
+        livres, self.possivel_wumpus = self.possivel_wumpus, 0
+        self._atualizar_seguros(livres)
+
+    def is_safe(self, pos):
+        return bool(self.seguro >> self.index(pos) & 1)
 
     def infer_action(self, perception):
         """
-        Método simples de inferência para fins didáticos.
-        Retorna uma ação baseada na percepção atual.
+        Atualiza a base com a percepção atual e escolhe a próxima ação: pegar o ouro,
+        atirar no Wumpus (o fedor garante que ele está ao lado), ir para uma célula
+        comprovadamente segura ainda não visitada ou, se não houver, arriscar a célula de
+        fronteira menos perigosa.
         """
+        atual = self.index(self.current_pos)
+        novidade = not self.visitado >> atual & 1
         self.update_knowledge(perception)
-        # Exemplo básico: se sentir brilho (GLITTER), tenta pegar o ouro
         if 'BRILHO' in perception:
             return 'AGARRAR'
-        if 'FEDOR' in perception:
+        if 'FEDOR' in perception and self.wumpus_vivo:
+            self.wumpus_killed()
             return 'TIRO'
 
-        # Exploração simples: andar para uma célula vizinha não visitada e provavelmente segura
-        for dx, dy, action in [(-1, 0, 'CIMA'), (1, 0, 'BAIXO'), (0, -1, 'ESQUERDA'), (0, 1, 'DIREITA')]:
-            nx, ny = self.current_pos[0] + dx, self.current_pos[1] + dy
-            if (nx, ny) not in self.known:
-                return action
-            if self.known[(nx, ny)]['seguro'] and not self.known[(nx, ny)]['visitado']:
-                return action
+        # O alvo só é reavaliado quando a base muda (primeira visita) ou quando é alcançado
+        if self.alvo is not None and self.visitado >> self.alvo & 1:
+            self.planner.discard(self.alvo)
+            self.alvo = None
+        if novidade or self.alvo is None:
+            self.alvo = self._escolher_alvo(atual)
+        acao = self.planner.next_step(atual, self.alvo) if self.alvo is not None else None
+        if acao is None:
+            # Nada a explorar: permanece em uma célula segura
+            return next((a for a, j in self._adjacentes[atual] if self.seguro >> j & 1), 'DIREITA')
+        return acao
+
+    def _escolher_alvo(self, atual):
+        # Célula segura não visitada mais próxima (pelo caminho seguro); se não houver, arrisca a fronteira
+        alvo = self.planner.nearest(atual, self.seguro & ~self.visitado)
+        return alvo if alvo is not None else self._escolher_risco(atual)
 
-        # Falha segura: não achou caminho bom → tenta sair andando
-        return 'DIREITA'
+    def _escolher_risco(self, atual):
+        # Célula de fronteira não sabidamente perigosa mais próxima, preferindo as livres do Wumpus
+        fronteira = self.fronteira & ~self.poco
+        if self.wumpus is not None and self.wumpus_vivo:
+            fronteira &= ~(1 << self.wumpus)
+        wumpus = self.possivel_wumpus if self.wumpus_vivo else 0
+        alvo = self.planner.nearest(atual, fronteira & ~wumpus)
+        return alvo if alvo is not None else self.planner.nearest(atual, fronteira)
 
     def update_position(self, action):
+        # O mundo não deixa o agente sair do grid: a posição é limitada às bordas
         x, y = self.current_pos
-        if action == 'CIMA':
+        limite = self.size - 1
+        if action == 'CIMA' and x > 0:
             self.current_pos = (x - 1, y)
-        elif action == 'BAIXO':
+        elif action == 'BAIXO' and x < limite:
             self.current_pos = (x + 1, y)
-        elif action == 'ESQUERDA':
+        elif action == 'ESQUERDA' and y > 0:
             self.current_pos = (x, y - 1)
-        elif action == 'DIREITA':
+        elif action == 'DIREITA' and y < limite:
             self.current_pos = (x, y + 1)
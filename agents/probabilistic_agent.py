@@ -0,0 +1,20 @@
+# ==============================
+# agents/probabilistic_agent.py
+# ==============================
+'''
+# Este arquivo implementa o ProbabilisticAgent, uma variação do LogicAgent para o
+# Wumpus World. O ciclo de percepção, decisão e registro é o mesmo do agente lógico,
+# mas a base de conhecimento (ProbabilisticKnowledgeBase) estima a probabilidade de
+# poço e do Wumpus nas células de fronteira e, quando não há movimento comprovadamente
+# seguro, escolhe a célula com menor risco em vez de uma heurística fixa.
+'''
+
+from agents.logic_agent import LogicAgent
+from agents.probabilistic_knowledge_base import ProbabilisticKnowledgeBase
+
+
+class ProbabilisticAgent(LogicAgent):
+    def __init__(self, world):
+        super().__init__(world)
+        # Base de conhecimento com inferência probabilística da fronteira
+        self.knowledge = ProbabilisticKnowledgeBase(world.size)
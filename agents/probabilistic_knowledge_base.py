@@ -0,0 +1,156 @@
+# ==============================
+# agents/probabilistic_knowledge_base.py
+# ==============================
+'''
+# Este arquivo implementa a classe ProbabilisticKnowledgeBase, uma extensão da
+# LogicKnowledgeBase usada pelo ProbabilisticAgent. Enquanto existir uma célula
+# comprovadamente segura, a navegação é a mesma do agente lógico; quando não existir,
+# o agente entra na célula de fronteira com menor probabilidade de morte.
+# A probabilidade de poço considera apenas as células de fronteira ligadas a brisas
+# ainda não explicadas: cada brisa exige pelo menos um poço entre seus vizinhos
+# candidatos. As restrições são divididas em componentes independentes (que não
+# compartilham células) e cada componente é resolvido enumerando suas configurações
+# consistentes, com peso p^k (1-p)^(n-k) pela probabilidade a priori p de poço. O
+# resultado de um componente depende só da sua assinatura (restrições renumeradas e p),
+# então fica em um cache compartilhado entre passos e episódios.
+'''
+
+import functools
+
+from agents.logic_knowledge_base import LogicKnowledgeBase, _bits
+
+# Maior componente resolvido por enumeração exata (2^n configurações); acima disso,
+# cada célula usa a aproximação da restrição mais forte que a contém
+MAX_VARIAVEIS_COMPONENTE = 16
+
+
+def _contar(mascara):
+    return bin(mascara).count("1")
+
+
+@functools.lru_cache(maxsize=4096)
+def component_probabilities(restricoes, n, p):
+    """
+    Probabilidade de poço de cada variável de um componente.
+    :param restricoes: Tupla ordenada de bitsets locais; cada um exige pelo menos um poço entre suas variáveis
+    :param n: Número de variáveis do componente
+    :param p: Probabilidade a priori de poço em uma célula
+    :return: Tupla com a probabilidade de poço de cada variável
+    """
+    if n > MAX_VARIAVEIS_COMPONENTE:
+        # Aproximação: P(poço | pelo menos um entre m células) da restrição mais forte
+        probabilidades = [p] * n
+        for r in restricoes:
+            condicional = p / (1 - (1 - p) ** _contar(r))
+            for i in _bits(r):
+                probabilidades[i] = max(probabilidades[i], condicional)
+        return tuple(probabilidades)
+
+    pesos = [p ** k * (1 - p) ** (n - k) for k in range(n + 1)]
+    total = 0.0
+    marginais = [0.0] * n
+    for configuracao in range(1 << n):
+        if all(configuracao & r for r in restricoes):
+            peso = pesos[_contar(configuracao)]
+            total += peso
+            for i in _bits(configuracao):
+                marginais[i] += peso
+    return tuple(m / total for m in marginais)
+
+
+class ProbabilisticKnowledgeBase(LogicKnowledgeBase):
+    def __init__(self, size, pit_prior=None):
+        """
+        :param size: Tamanho do mundo (size x size)
+        :param pit_prior: Probabilidade a priori de poço por célula (padrão: size // 2 poços
+                          distribuídos entre as células que não são do agente, do ouro ou do Wumpus)
+        """
+        super().__init__(size)
+        if pit_prior is None:
+            pit_prior = (size // 2) / max(size * size - 3, 1)
+        self.pit_prior = min(max(pit_prior, 0.01), 0.99)
+
+    def _restricoes_poco(self):
+        # Brisas ainda não explicadas por um poço conhecido, como bitsets de células candidatas,
+        # sem as redundantes (uma restrição que contém outra é implicada por ela). Células
+        # visitadas ou seguras não podem ter poço e ficam fora das candidatas
+        livres = self.visitado | self.seguro
+        restricoes = set()
+        for b in self.brisas:
+            candidatos = self._vizinhanca[b] & self.possivel_poco & ~livres
+            if candidatos and not candidatos & self.poco:
+                restricoes.add(candidatos)
+        minimas = sorted(restricoes, key=_contar)
+        return [r for i, r in enumerate(minimas) if not any(s & r == s for s in minimas[:i])]
+
+    def _componentes(self, restricoes):
+        # Agrupa as restrições que compartilham células: [(bitset das variáveis, [restrições])]
+        componentes = []
+        for r in restricoes:
+            variaveis, grupo = r, [r]
+            separados = []
+            for outras, restricoes_outras in componentes:
+                if outras & variaveis:
+                    variaveis |= outras
+                    grupo.extend(restricoes_outras)
+                else:
+                    separados.append((outras, restricoes_outras))
+            separados.append((variaveis, grupo))
+            componentes = separados
+        return componentes
+
+    def pit_probabilities(self):
+        """
+        Probabilidade de poço das células de fronteira.
+        :return: Dicionário índice da célula → probabilidade
+        """
+        probabilidades = {}
+        for j in _bits(self.fronteira):
+            if self.poco >> j & 1:
+                probabilidades[j] = 1.0
+            elif self.possivel_poco >> j & 1:
+                probabilidades[j] = self.pit_prior  # Sem brisa pendente ao lado: apenas a priori
+            else:
+                probabilidades[j] = 0.0
+
+        for variaveis, restricoes in self._componentes(self._restricoes_poco()):
+            celulas = list(_bits(variaveis))
+            local = {j: i for i, j in enumerate(celulas)}
+            assinatura = []
+            for r in restricoes:
+                mascara = 0
+                for j in _bits(r):
+                    mascara |= 1 << local[j]
+                assinatura.append(mascara)
+            resultado = component_probabilities(tuple(sorted(assinatura)), len(celulas), self.pit_prior)
+            for j, probabilidade in zip(celulas, resultado):
+                if j in probabilidades:
+                    probabilidades[j] = probabilidade
+        return probabilidades
+
+    def wumpus_probabilities(self):
+        """
+        Probabilidade do Wumpus nas células de fronteira. Há um único Wumpus, então as
+        configurações consistentes são as células ainda possíveis, todas igualmente prováveis.
+        :return: Dicionário índice da célula → probabilidade
+        """
+        possiveis = self.possivel_wumpus if self.wumpus_vivo else 0
+        quantidade = _contar(possiveis)
+        return {j: (1.0 / quantidade if possiveis >> j & 1 else 0.0) for j in _bits(self.fronteira)}
+
+    def _escolher_risco(self, atual):
+        # Célula de fronteira com menor probabilidade de morte; empate: a mais próxima pelo caminho seguro
+        if not self.fronteira:
+            return None
+        pocos = self.pit_probabilities()
+        wumpus = self.wumpus_probabilities()
+        distancias = self.planner.distances(atual)
+        infinito = len(self._adjacentes)
+
+        def custo(j):
+            risco = 1 - (1 - pocos[j]) * (1 - wumpus[j])
+            entrada = min((distancias[k] for _, k in self._adjacentes[j] if k in distancias), default=infinito)
+            return round(risco, 9), entrada
+
+        alvo = min(_bits(self.fronteira), key=custo)
+        return alvo if custo(alvo)[0] < 1 else None
@@ -0,0 +1,133 @@
+# ==============================
+# agents/safe_path_planner.py
+# ==============================
+'''
+# Este arquivo implementa a classe SafePathPlanner, usada pela LogicKnowledgeBase para
+# navegar apenas por células comprovadamente seguras. Os caminhos vêm de mapas de
+# distância (BFS) calculados a partir de uma célula de origem e guardados em um cache
+# LRU. Quando novas células passam a ser seguras, os mapas em cache não são descartados:
+# as distâncias só podem diminuir, então cada mapa é corrigido por uma BFS local que
+# parte da célula nova e percorre apenas as células cuja distância melhorou.
+'''
+
+from collections import OrderedDict, deque
+
+
+class SafePathPlanner:
+    def __init__(self, adjacentes, seguro=0, max_maps=16):
+        """
+        :param adjacentes: Vizinhos de cada célula: lista de (ação, índice) por índice de célula
+        :param seguro: Bitset inicial das células seguras
+        :param max_maps: Número máximo de mapas de distância mantidos em cache
+        """
+        self._adjacentes = adjacentes
+        self.seguro = seguro
+        self.max_maps = max_maps
+        self._mapas = OrderedDict()  # origem → {célula: distância}
+
+    def add_safe(self, mascara):
+        """
+        Marca as células do bitset como seguras e atualiza os mapas em cache.
+        """
+        novas = mascara & ~self.seguro
+        if not novas:
+            return
+        self.seguro |= novas
+        celulas = []
+        while novas:
+            menor = novas & -novas
+            celulas.append(menor.bit_length() - 1)
+            novas ^= menor
+        for distancias in self._mapas.values():
+            for celula in celulas:
+                self._relaxar(distancias, celula)
+
+    def _relaxar(self, distancias, celula):
+        # Distância da célula nova pelos vizinhos já alcançados; propaga só as melhorias
+        alcancados = [distancias[j] for _, j in self._adjacentes[celula] if j in distancias]
+        if not alcancados or distancias.get(celula, len(self._adjacentes)) <= min(alcancados) + 1:
+            return
+        distancias[celula] = min(alcancados) + 1
+        fila = deque([celula])
+        adjacentes, seguro = self._adjacentes, self.seguro
+        while fila:
+            atual = fila.popleft()
+            proxima = distancias[atual] + 1
+            for _, j in adjacentes[atual]:
+                if seguro >> j & 1 and distancias.get(j, proxima + 1) > proxima:
+                    distancias[j] = proxima
+                    fila.append(j)
+
+    def distances(self, origem):
+        """
+        Mapa de distâncias (em passos) da origem até cada célula segura alcançável.
+        A origem pode ser insegura (ex.: uma célula de fronteira a ser arriscada).
+        :return: Dicionário célula → distância (não deve ser alterado)
+        """
+        distancias = self._mapas.get(origem)
+        if distancias is not None:
+            self._mapas.move_to_end(origem)
+            return distancias
+        distancias = {origem: 0}
+        fila = deque([origem])
+        adjacentes, seguro = self._adjacentes, self.seguro
+        while fila:
+            atual = fila.popleft()
+            proxima = distancias[atual] + 1
+            for _, j in adjacentes[atual]:
+                if j not in distancias and seguro >> j & 1:
+                    distancias[j] = proxima
+                    fila.append(j)
+        self._mapas[origem] = distancias
+        if len(self._mapas) > self.max_maps:
+            self._mapas.popitem(last=False)
+        return distancias
+
+    def discard(self, origem):
+        """
+        Remove do cache o mapa de uma origem que não será mais usada (ex.: alvo já alcançado).
+        """
+        self._mapas.pop(origem, None)
+
+    def nearest(self, origem, alvos):
+        """
+        Célula de alvos mais próxima da origem por caminhos seguros. A busca para no
+        primeiro alvo encontrado (alvos inseguros são alcançados, mas não expandidos).
+        :param alvos: Bitset das células candidatas
+        :return: Índice da célula ou None se nenhuma for alcançável
+        """
+        if not alvos:
+            return None
+        if alvos >> origem & 1:
+            return origem
+        visitadas = 1 << origem
+        fila = deque([origem])
+        adjacentes, seguro = self._adjacentes, self.seguro
+        while fila:
+            atual = fila.popleft()
+            for _, j in adjacentes[atual]:
+                if visitadas >> j & 1:
+                    continue
+                visitadas |= 1 << j
+                if alvos >> j & 1:
+                    return j
+                if seguro >> j & 1:
+                    fila.append(j)
+        return None
+
+    def next_step(self, atual, alvo):
+        """
+        Ação do primeiro passo de um caminho mais curto de atual até alvo por células seguras.
+        :return: Ação ou None se o alvo não for alcançável
+        """
+        for acao, j in self._adjacentes[atual]:
+            if j == alvo:
+                return acao
+        distancias = self.distances(alvo)
+        d = distancias.get(atual)
+        if d is None or d == 0:
+            return None
+        for acao, j in self._adjacentes[atual]:
+            if distancias.get(j) == d - 1:
+                return acao
+        return None
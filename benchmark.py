@@ -8,47 +8,93 @@ Para cada agente, executa várias rodadas, mede o tempo de execução,
 e retorna um resumo com as taxas de vitória, morte, sobrevivência e tempos médios.
 '''
 
+import os
 import time
 from world.world import World
 from agents.manual_agent import ManualAgent
 from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
 from agents.genetic_agent import GeneticAgent
+from utils.memory_profiler import profile_run
+from ga.seeding import run_seed_sequence
+from utils.cost_model import CostModel
+from utils.watchdog import (BudgetedWorld, EpisodeTimeout, episode_status, time_limit,
+                            STATUS_TEMPO_ESGOTADO, max_steps_for)
 
 # Dicionário que associa nomes de agentes às suas classes
 AGENTES_DISPONIVEIS = {
     'manual': ManualAgent,
     'logico': LogicAgent,
+    'probabilistico': ProbabilisticAgent,
     'genetico': GeneticAgent
 }
 
-TEMPOS_MEDIOS_ESTIMADOS = {
-    'logico': 0.10,
-    'genetico': 0.30
-}
-
-def executar_benchmark(agente_nome, world_size=4, num_execucoes=10):
-    vitorias, mortes, sobrevivencias = 0, 0, 0
+def executar_benchmark(agente_nome, world_size=4, num_execucoes=10, ga_workers=1, mem_profile=None, mem_profile_dir="logs",
+                       ga_seed=0, cache=None, modelo_custo=None, max_steps=None, timeout=None):
+    # max_steps e timeout limitam os passos e o tempo (segundos) de cada episódio (ver utils/watchdog.py)
+    max_steps = max_steps_for(world_size, max_steps)
+    vitorias, mortes, sobrevivencias, tempo_esgotado = 0, 0, 0, 0
     dados_extra_capturados = {}
     tempos = []
-    tempo_estimado = TEMPOS_MEDIOS_ESTIMADOS.get(agente_nome, 0.2) * num_execucoes
+    # Estimativa a partir dos tempos observados em execuções anteriores (ver utils/cost_model.py)
+    modelo_custo = modelo_custo if modelo_custo is not None else CostModel()
+    params_custo = {"n_workers": ga_workers} if agente_nome == "genetico" else {}
+    tempo_estimado = modelo_custo.estimate(agente_nome, world_size, params_custo) * num_execucoes
     print(f"\n⏳ Estimativa de tempo total para '{agente_nome}' ({world_size}x{world_size}): {tempo_estimado:.2f}s")
 
+    # Cache de resultados (ver utils/result_cache.py): não usado para o agente manual
+    # (interativo) nem com perfil de memória (que grava relatórios próprios)
+    usar_cache = cache is not None and agente_nome != "manual" and not mem_profile
+    params_cache = {"n_workers": ga_workers, "ga_seed": ga_seed} if agente_nome == "genetico" else {}
+    # O limite de passos e o tempo máximo mudam o status de uma execução: fazem parte da chave
+    params_cache.update(max_steps=max_steps, timeout=timeout)
+
     for i in range(num_execucoes):
         seed = i
-        mundo = World(size=world_size, seed=seed)
+        guardado = cache.get(agente_nome, world_size, seed, params_cache) if usar_cache else None
+        if guardado is not None:
+            print(f"💾 Execução {i + 1}/{num_execucoes} [{agente_nome}] recuperada do cache")
+            tempos.append(guardado["tempo"])
+            if i == 0 and guardado["dados_extra"]:
+                dados_extra_capturados = guardado["dados_extra"]
+            vitorias += guardado["status"] == "vitória"
+            mortes += guardado["status"] == "morte"
+            sobrevivencias += guardado["status"] == "sobreviveu"
+            tempo_esgotado += guardado["status"] == STATUS_TEMPO_ESGOTADO
+            continue
+
+        mundo = BudgetedWorld.wrap(World(size=world_size, seed=seed), max_steps, timeout)
         agente_cls = AGENTES_DISPONIVEIS[agente_nome]
-        agente = agente_cls(mundo)
+        # Workers de avaliação de fitness (apenas para o agente genético)
+        # Gerador próprio da execução, derivado de (ga_seed, agente, tamanho, índice)
+        agente_kwargs = {
+            "n_workers": ga_workers, "seed_seq": run_seed_sequence(ga_seed, agente_nome, world_size, i)
+        } if agente_nome == "genetico" else {}
+        # Perfil de memória (tracemalloc): o GA amostra a cada mem_profile gerações,
+        # os demais agentes são medidos do início ao fim da execução
+        relatorio = os.path.join(mem_profile_dir, f"tracemalloc_seed_{seed}.txt") if mem_profile else None
+        if relatorio and agente_nome == "genetico":
+            agente_kwargs.update(memory_profile_every=mem_profile, memory_report_path=relatorio)
+        agente = agente_cls(mundo, **agente_kwargs)
         if hasattr(agente, "logger"):
             agente.logger = None
 
         print(f"🚀 Execução {i + 1}/{num_execucoes} [{agente_nome}]")
 
         inicio = time.perf_counter()
+        falhou, interrompido = False, False
         try:
-            resultado = agente.run()
+            with time_limit(timeout):
+                if relatorio and agente_nome != "genetico":
+                    resultado = profile_run(agente.run, relatorio)
+                else:
+                    resultado = agente.run()
+        except EpisodeTimeout:
+            print(f"⏰ Execução {i + 1} interrompida: tempo esgotado")
+            resultado, interrompido = None, True
         except Exception as e:
             print(f"❌ Erro na execução {i + 1}: {e}")
-            resultado = None
+            resultado, falhou = None, True
         fim = time.perf_counter()
 
         tempos.append(fim - inicio)
@@ -56,12 +102,21 @@ def executar_benchmark(agente_nome, world_size=4, num_execucoes=10):
         if i == 0 and agente_nome == "genetico" and isinstance(resultado, dict):
             dados_extra_capturados = resultado.get("dados_extra", {})
         
-        if mundo.won:
-            vitorias += 1
-        elif not mundo.is_alive:
-            mortes += 1
-        else:
-            sobrevivencias += 1
+        status = episode_status(mundo, interrompido)
+        vitorias += status == "vitória"
+        mortes += status == "morte"
+        sobrevivencias += status == "sobreviveu"
+        tempo_esgotado += status == STATUS_TEMPO_ESGOTADO
+
+        # Execuções com erro ou interrompidas não entram no modelo de custo nem no cache
+        if falhou or status == STATUS_TEMPO_ESGOTADO:
+            continue
+        if agente_nome != "manual":
+            modelo_custo.record(agente_nome, world_size, fim - inicio, params_custo)
+        if usar_cache:
+            dados_extra = resultado.get("dados_extra", {}) if isinstance(resultado, dict) else {}
+            cache.put(agente_nome, world_size, seed, params_cache,
+                      {"status": status, "tempo": fim - inicio, "dados_extra": dados_extra})
 
     tempo_total = sum(tempos)
     tempo_medio = tempo_total / num_execucoes
@@ -72,6 +127,7 @@ def executar_benchmark(agente_nome, world_size=4, num_execucoes=10):
         "vitórias": vitorias,
         "mortes": mortes,
         "sobreviveu": sobrevivencias,
+        "tempo_esgotado": tempo_esgotado,
         "tempo_total": tempo_total,
         "tempo_médio": tempo_medio,
         "dados_extra": dados_extra_capturados
@@ -86,5 +142,6 @@ if __name__ == "__main__":
         print(f"Vitórias: {resultado['vitórias']}")
         print(f"Mortes: {resultado['mortes']}")
         print(f"Sobreviveu sem vencer: {resultado['sobreviveu']}")
+        print(f"Tempo esgotado: {resultado['tempo_esgotado']}")
         print(f"Tempo total: {resultado['tempo_total']:.2f}s")
         print(f"Tempo médio por execução: {resultado['tempo_médio']:.3f}s")
\ No newline at end of file
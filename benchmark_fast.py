@@ -4,56 +4,70 @@
 '''
 Este benchmark executa múltiplas simulações dos agentes 'lógico' e 'genético'
 no ambiente Wumpus World, para diferentes tamanhos de mundo (4x4, 6x6, 8x8).
-Para cada combinação agente+tamanho, executa várias rodadas em paralelo,
-mede o tempo de execução, salva os resultados e gráficos em pastas organizadas,
+Todas as rodadas de todas as combinações agente+tamanho são executadas em um único
+pool de processos (das mais longas para as mais curtas), mede o tempo de execução, salva os resultados e gráficos em pastas organizadas,
 e exibe um resumo com as taxas de vitória, morte, sobrevivência e tempos médios.
 '''
 
 import time
 import argparse
+import multiprocessing
+import queue
+import signal
 import matplotlib.pyplot as plt
 import pandas as pd
-from joblib import Parallel, delayed
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from world.world import World
 from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
 from agents.genetic_agent import GeneticAgent
+from utils.memory_profiler import profile_run
+from ga.seeding import run_seed_sequence
+from utils.result_cache import ResultCache, CAMINHO_PADRAO
+from utils.cost_model import CostModel
+from utils.watchdog import (BudgetedWorld, EpisodeTimeout, episode_status, time_limit,
+                            STATUS_TEMPO_ESGOTADO, PASSOS_POR_CELULA, max_steps_for)
 import os
 from datetime import datetime
 import seaborn as sns
 
+# Tempo extra (segundos) além do timeout antes de encerrar à força um worker travado
+MARGEM_WATCHDOG = 10.0
+
 # Dicionário que associa nomes de agentes às suas classes
 AGENTES_DISPONIVEIS = {
     'logico': LogicAgent,
+    'probabilistico': ProbabilisticAgent,
     'genetico': GeneticAgent
 }
 
-TEMPOS_MEDIOS_ESTIMADOS = {
-    'logico': 0.10,
-    'genetico': 0.30
-}
-
-def simular_execucao(agente_cls, world_size, seed):
-    mundo = World(size=world_size, seed=seed)
-    agente = agente_cls(mundo)
+def simular_execucao(agente_cls, world_size, seed, agente_kwargs=None, relatorio_memoria=None,
+                     max_steps=None, timeout=None):
+    # Episódio com limite de passos e de tempo (ver utils/watchdog.py)
+    mundo = BudgetedWorld.wrap(World(size=world_size, seed=seed), max_steps_for(world_size, max_steps), timeout)
+    agente = agente_cls(mundo, **(agente_kwargs or {}))
     if hasattr(agente, "logger"):
         agente.logger = None
 
+    interrompido = False
+    inicio = time.perf_counter()
     try:
-        inicio = time.perf_counter()
-        resultado = agente.run()
-        fim = time.perf_counter()
+        with time_limit(timeout):
+            if relatorio_memoria:
+                # Agentes sem gerações: perfil de memória do início ao fim da execução
+                resultado = profile_run(agente.run, relatorio_memoria)
+            else:
+                resultado = agente.run()
+    except EpisodeTimeout:
+        interrompido, resultado = True, None
     except Exception as e:
         print(f"❌ Erro durante execução com semente {seed}: {e}")
         return None  # falha na execução
+    fim = time.perf_counter()
 
     tempo = fim - inicio
-
-    if mundo.won:
-        status = "vitória"
-    elif not mundo.is_alive:
-        status = "morte"
-    else:
-        status = "sobreviveu"
+    status = episode_status(mundo, interrompido)
 
     # Garante retorno consistente com dados extras
     dados_extra = resultado.get("fitness", {}) if isinstance(resultado, dict) else {}
@@ -64,24 +78,210 @@ def simular_execucao(agente_cls, world_size, seed):
         "dados_extra": dados_extra
     }
 
-def executar_benchmark(agente_nome, world_size, num_execucoes):
+def kwargs_por_execucao(agente_kwargs, world_size, seed, ga_history_dir=None, relatorio_memoria=None, ga_seed=None):
+    # Cada execução grava seus históricos do GA em uma subpasta própria
+    kwargs = dict(agente_kwargs)
+    if ga_seed is not None:
+        # SeedSequence própria da execução: o resultado não depende de qual worker a executa
+        kwargs["seed_seq"] = run_seed_sequence(ga_seed, "genetico", world_size, seed)
+    if ga_history_dir:
+        kwargs["history_dir"] = os.path.join(ga_history_dir, f"{world_size}x{world_size}", f"seed_{seed}")
+    if relatorio_memoria:
+        kwargs["memory_report_path"] = relatorio_memoria
+    return kwargs
+
+def relatorio_memoria(mem_profile_dir, seed):
+    # Caminho do relatório de memória (tracemalloc) de uma execução
+    return os.path.join(mem_profile_dir, f"tracemalloc_seed_{seed}.txt") if mem_profile_dir else None
+
+def preparar_par(agente_nome, world_size, num_execucoes, ga_workers=1, ga_history_rows=None, ga_history_dir=None,
+                 ga_profile=False, mem_profile=None, mem_profile_dir=None, ga_seed=0,
+                 ga_warm_start_dir=None, ga_warm_start_fraction=1.0, cache=None,
+                 max_steps=None, timeout=None):
+    """
+    Prepara as execuções de um par (agente, tamanho): consulta o cache e monta os
+    argumentos de simular_execucao das sementes que ainda precisam ser executadas.
+    max_steps e timeout limitam os passos e o tempo (segundos) de cada episódio
+    (max_steps None = padrão proporcional ao mundo, 0 = sem limite; ver max_steps_for).
+    :return: Dicionário com agente, tamanho, resultados já conhecidos (semente → resultado),
+             tarefas pendentes [(semente, argumentos)] e a chave do cache (None = sem cache)
+    """
     agente_cls = AGENTES_DISPONIVEIS[agente_nome]
+    # Workers de avaliação de fitness dentro de cada execução do agente genético e limite
+    # de linhas dos históricos do GA mantidas em RAM; ga_profile mede o tempo por fase das gerações
+    agente_kwargs = {
+        "n_workers": ga_workers, "history_max_rows": ga_history_rows, "profile_phases": ga_profile
+    } if agente_nome == "genetico" else {}
+    if agente_nome == "genetico" and ga_warm_start_dir:
+        # Populações finais salvas por mundo e reutilizadas nas rodadas seguintes do mesmo mundo
+        agente_kwargs.update(warm_start_dir=ga_warm_start_dir, warm_start_fraction=ga_warm_start_fraction)
+    if agente_nome != "genetico":
+        ga_history_dir = None
+    # Perfil de memória: o GA amostra a cada mem_profile gerações; os demais agentes
+    # são medidos do início ao fim de cada execução
+    if not mem_profile:
+        mem_profile_dir = None
+    elif agente_nome == "genetico":
+        agente_kwargs["memory_profile_every"] = mem_profile
+
+    # Cache de resultados (ver utils/result_cache.py): execuções já feitas com a mesma semente,
+    # parâmetros e versão do código não são refeitas. Não é usado quando a execução grava
+    # arquivos próprios (históricos, perfil de memória) ou parte de populações salvas (warm start)
+    usar_cache = cache is not None and not (ga_history_dir or mem_profile_dir or ga_warm_start_dir)
+    params_cache = dict(agente_kwargs, ga_seed=ga_seed) if agente_nome == "genetico" else {}
+    # O limite de passos e o tempo máximo mudam o status de uma execução: fazem parte da chave
+    # (com o limite efetivo: o padrão e o mesmo valor explícito compartilham os resultados)
+    params_cache.update(max_steps=max_steps_for(world_size, max_steps), timeout=timeout)
+    resultados = {}
+    if usar_cache:
+        for seed in range(num_execucoes):
+            guardado = cache.get(agente_nome, world_size, seed, params_cache)
+            if guardado is not None:
+                resultados[seed] = guardado
+
+    pendentes = [
+        (seed, (agente_cls, world_size, seed,
+                kwargs_por_execucao(agente_kwargs, world_size, seed, ga_history_dir,
+                                    relatorio_memoria(mem_profile_dir, seed) if agente_nome == "genetico" else None,
+                                    ga_seed if agente_nome == "genetico" else None),
+                relatorio_memoria(mem_profile_dir, seed) if agente_nome != "genetico" else None,
+                max_steps, timeout))
+        for seed in range(num_execucoes) if seed not in resultados
+    ]
+    return {
+        "agente": agente_nome, "tamanho_mundo": world_size, "num_execucoes": num_execucoes,
+        "resultados": resultados, "pendentes": pendentes,
+        "cache": cache if usar_cache else None, "params_cache": params_cache,
+        # Parâmetros que influenciam o tempo de execução (chave do modelo de custo)
+        "params_custo": dict(agente_kwargs),
+        "timeout": timeout,
+    }
+
+def executar_pares(pares, n_jobs=None, modelo_custo=None):
+    """
+    Executa as tarefas pendentes de todos os pares em um único pool de processos.
+    As tarefas são enviadas das mais longas para as mais curtas (tempo esperado pelo
+    modelo de custo), uma por worker livre, e os resultados são registrados à medida que
+    terminam. Se uma execução passar do timeout + MARGEM_WATCHDOG (worker travado), os
+    workers são encerrados, a execução é registrada como tempo esgotado e as demais em
+    andamento são reenviadas a um pool novo.
+    :param pares: Lista de dicionários criados por preparar_par
+    :param n_jobs: Número de processos (None = todos os núcleos)
+    :param modelo_custo: CostModel que estima e registra os tempos (None = histórico padrão em logs/)
+    :return: Lista de resultados agregados (agregar_resultados), na ordem de pares
+    """
+    modelo_custo = modelo_custo if modelo_custo is not None else CostModel()
+    n_processos = n_jobs or os.cpu_count() or 1
+    tarefas = []
+    for par in pares:
+        agente_nome, world_size = par["agente"], par["tamanho_mundo"]
+        print(f"\n🔁 Agente = '{agente_nome}', mundo = {world_size}x{world_size}")
+        if par["resultados"]:
+            print(f"💾 {len(par['resultados'])}/{par['num_execucoes']} execuções recuperadas do cache")
+        custo = modelo_custo.estimate(agente_nome, world_size, par["params_custo"])
+        print(f"⏳ Estimativa de tempo total: {custo * len(par['pendentes']):.2f}s ({custo:.3f}s por execução)")
+        tarefas += [(custo, par, seed, args) for seed, args in par["pendentes"]]
+    # Mais longas primeiro: as curtas preenchem os núcleos livres no fim da varredura
+    tarefas.sort(key=lambda tarefa: tarefa[0], reverse=True)
+
+    concluidas = 0
 
-    print(f"\n🔁 Iniciando: agente = '{agente_nome}', mundo = {world_size}x{world_size}")
-    estimativa = TEMPOS_MEDIOS_ESTIMADOS.get(agente_nome, 0.2) * num_execucoes
-    print(f"⏳ Estimativa de tempo total: {estimativa:.2f}s")
+    def registrar(par, seed, resultado):
+        nonlocal concluidas
+        concluidas += 1
+        par["resultados"][seed] = resultado
+        # Execuções interrompidas não entram no cache nem no modelo de custo (tempo truncado)
+        if resultado is not None and resultado["status"] != STATUS_TEMPO_ESGOTADO:
+            modelo_custo.record(par["agente"], par["tamanho_mundo"], resultado["tempo"], par["params_custo"])
+            if par["cache"] is not None:
+                par["cache"].put(par["agente"], par["tamanho_mundo"], seed, par["params_cache"], resultado)
+        status = resultado["status"] if resultado is not None else "erro"
+        print(f"✔️ [{concluidas}/{len(tarefas)}] {par['agente']} {par['tamanho_mundo']}x{par['tamanho_mundo']} "
+              f"semente {seed}: {status}")
+        if len(par["resultados"]) == par["num_execucoes"]:
+            print(f"✅ Concluído: '{par['agente']}' no mundo {par['tamanho_mundo']}x{par['tamanho_mundo']}")
 
-    resultados = Parallel(n_jobs=-1)(
-        delayed(simular_execucao)(agente_cls, world_size, seed)
-        for seed in range(num_execucoes)
-    )
+    if tarefas:
+        eta = modelo_custo.makespan([custo for custo, *_ in tarefas], min(n_processos, len(tarefas)))
+        print(f"\n⏳ {len(tarefas)} execuções em {n_processos} processos: término estimado em {eta:.2f}s")
+        executar_fila(deque(tarefas), n_processos, registrar)
 
+    return [
+        agregar_resultados(par["agente"], par["tamanho_mundo"],
+                           [par["resultados"][seed] for seed in range(par["num_execucoes"])])
+        for par in pares
+    ]
+
+def _registrar_worker(pids):
+    # Initializer dos workers: informa o PID para que um worker travado possa ser encerrado
+    pids.put(os.getpid())
+
+def _novo_pool(n_processos):
+    # Pool de processos e a fila em que cada worker registra o próprio PID
+    pids = multiprocessing.get_context().Queue()
+    return ProcessPoolExecutor(max_workers=n_processos, initializer=_registrar_worker, initargs=(pids,)), pids
+
+def _encerrar_workers(pids):
+    # Encerra todos os workers que registraram o PID (SIGTERM; TerminateProcess no Windows)
+    while True:
+        try:
+            pid = pids.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+def executar_fila(fila, n_processos, registrar):
+    """
+    Executa as tarefas da fila (custo, par, semente, argumentos) em um pool de processos,
+    mantendo no máximo uma tarefa por worker, e chama registrar(par, semente, resultado)
+    a cada execução concluída.
+    """
+    pool, pids = _novo_pool(n_processos)
+    ativos = {}  # future → (tarefa, início)
+    try:
+        while fila or ativos:
+            while fila and len(ativos) < n_processos:
+                tarefa = fila.popleft()
+                ativos[pool.submit(simular_execucao, *tarefa[3])] = (tarefa, time.perf_counter())
+
+            # Espera a próxima conclusão ou o prazo mais próximo de uma execução em andamento
+            prazos = [inicio + tarefa[1]["timeout"] + MARGEM_WATCHDOG
+                      for tarefa, inicio in ativos.values() if tarefa[1]["timeout"]]
+            espera = max(0.0, min(prazos) - time.perf_counter()) if prazos else None
+            prontos, _ = wait(ativos, timeout=espera, return_when=FIRST_COMPLETED)
+            for future in prontos:
+                tarefa, _ = ativos.pop(future)
+                registrar(tarefa[1], tarefa[2], future.result())
+
+            agora = time.perf_counter()
+            travadas = [future for future, (tarefa, inicio) in ativos.items()
+                        if tarefa[1]["timeout"] and agora - inicio >= tarefa[1]["timeout"] + MARGEM_WATCHDOG]
+            if travadas:
+                # Um worker travado só pode ser interrompido encerrando o processo: encerra o pool,
+                # registra as execuções vencidas e reenvia as demais a um pool novo
+                _encerrar_workers(pids)
+                pool.shutdown(wait=False, cancel_futures=True)
+                for future in travadas:
+                    tarefa, inicio = ativos.pop(future)
+                    registrar(tarefa[1], tarefa[2],
+                              {"status": STATUS_TEMPO_ESGOTADO, "tempo": agora - inicio, "dados_extra": {}})
+                fila.extendleft(reversed([tarefa for tarefa, _ in ativos.values()]))
+                ativos.clear()
+                pool, pids = _novo_pool(n_processos)
+    finally:
+        pool.shutdown()
+
+def agregar_resultados(agente_nome, world_size, resultados):
     # Filtra apenas execuções válidas
     resultados_validos = [r for r in resultados if r is not None]
 
     vitorias = sum(1 for r in resultados_validos if r["status"] == "vitória")
     mortes = sum(1 for r in resultados_validos if r["status"] == "morte")
     sobrevivencias = sum(1 for r in resultados_validos if r["status"] == "sobreviveu")
+    tempo_esgotado = sum(1 for r in resultados_validos if r["status"] == STATUS_TEMPO_ESGOTADO)
     tempos = [r["tempo"] for r in resultados_validos]
     tempo_total = sum(tempos)
     tempo_medio = tempo_total / len(tempos) if tempos else 0.0
@@ -100,11 +300,30 @@ def executar_benchmark(agente_nome, world_size, num_execucoes):
         "vitórias": vitorias,
         "mortes": mortes,
         "sobreviveu": sobrevivencias,
+        "tempo_esgotado": tempo_esgotado,
         "tempo_total": tempo_total,
         "tempo_médio": tempo_medio,
         "dados_extra": dados_extra
     }
 
+def executar_benchmark(agente_nome, world_size, num_execucoes, **opcoes):
+    # Um único par (agente, tamanho); as opções são as de preparar_par
+    return executar_pares([preparar_par(agente_nome, world_size, num_execucoes, **opcoes)])[0]
+
+def executar_varredura(agentes, sizes, num_execucoes, n_jobs=None, mem_profile_root=None, modelo_custo=None, **opcoes):
+    """
+    Executa todas as combinações (tamanho, agente) da varredura em um único pool de processos.
+    :param mem_profile_root: Pasta onde são criadas as pastas memory_profile_<agente>_<tamanho>
+    :param opcoes: Demais opções de preparar_par (ga_workers, ga_seed, cache, ...)
+    :return: Lista de resultados agregados, na ordem tamanho → agente
+    """
+    pares = []
+    for size in sizes:
+        for nome in agentes:
+            pasta_memoria = os.path.join(mem_profile_root, f"memory_profile_{nome}_{size}x{size}") if mem_profile_root else None
+            pares.append(preparar_par(nome, size, num_execucoes, mem_profile_dir=pasta_memoria, **opcoes))
+    return executar_pares(pares, n_jobs, modelo_custo)
+
 def gerar_graficos(df_resultados, output_dir):
     """
     Gera e salva gráficos simples de barras para vitórias, mortes e tempo médio por agente e tamanho de mundo.
@@ -136,6 +355,36 @@ if __name__ == "__main__":
     parser.add_argument("--sizes", nargs="+", type=int, default=[4, 6, 8])
     parser.add_argument("--agentes", nargs="+", choices=AGENTES_DISPONIVEIS.keys(),
                         default=list(AGENTES_DISPONIVEIS.keys()))
+    parser.add_argument("--ga-workers", type=int, default=1,
+                        help="Workers de avaliação de fitness por execução do agente genético")
+    parser.add_argument("--ga-history-rows", type=int, default=None,
+                        help="Máximo de gerações dos históricos do GA mantidas em RAM (amostragem)")
+    parser.add_argument("--ga-spill-history", action="store_true",
+                        help="Grava os históricos completos do GA em .npy na pasta da execução")
+    parser.add_argument("--ga-profile", action="store_true",
+                        help="Mede o tempo de cada fase das gerações do GA")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Semente base dos geradores do GA (cada execução recebe seu próprio fluxo)")
+    parser.add_argument("--mem-profile", type=int, default=0,
+                        help="Perfil de memória com tracemalloc: snapshot a cada N gerações do GA (0 desativa)")
+    parser.add_argument("--ga-warm-start", nargs="?", const=os.path.join("logs", "populacoes_ga"), default=None,
+                        metavar="PASTA",
+                        help="Salva a população final do GA por mundo e parte dela nas execuções seguintes "
+                             "(padrão: logs/populacoes_ga)")
+    parser.add_argument("--ga-warm-fraction", type=float, default=1.0,
+                        help="Fração da população inicial tirada da população salva (o restante é aleatório)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não usa o cache de resultados (todas as execuções são refeitas)")
+    parser.add_argument("--cache-path", default=CAMINHO_PADRAO,
+                        help=f"Arquivo SQLite do cache de resultados (padrão: {CAMINHO_PADRAO})")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Remove do cache os resultados dos agentes e tamanhos selecionados antes de executar")
+    parser.add_argument("--prune-cache", action="store_true",
+                        help="Remove do cache os resultados gravados por outras versões do código")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help=f"Limite de passos por episódio (padrão: {PASSOS_POR_CELULA} × tamanho²; 0 desativa)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Tempo máximo de cada execução em segundos (workers travados são reiniciados)")
     args = parser.parse_args()
 
     logs_dir = "logs"
@@ -144,11 +393,23 @@ if __name__ == "__main__":
     output_dir = os.path.join(logs_dir, f"run_{timestamp}")
     os.makedirs(output_dir, exist_ok=True)
 
-    resultados = []
-    for size in args.sizes:
-        for nome in args.agentes:
-            resultado = executar_benchmark(nome, size, args.execucoes)
-            resultados.append(resultado)
+    cache = None if args.no_cache else ResultCache(args.cache_path)
+    if cache is not None:
+        if args.prune_cache:
+            print(f"🧹 {cache.invalidate(stale_only=True)} resultados de outras versões do código removidos do cache")
+        if args.clear_cache:
+            removidos = sum(cache.invalidate(nome, size) for nome in args.agentes for size in args.sizes)
+            print(f"🧹 {removidos} resultados removidos do cache")
+
+    # Um único pool de processos para todas as combinações (agente, tamanho, semente)
+    resultados = executar_varredura(
+        args.agentes, args.sizes, args.execucoes, ga_workers=args.ga_workers, ga_history_rows=args.ga_history_rows,
+        ga_history_dir=os.path.join(output_dir, "historico_ga") if args.ga_spill_history else None,
+        ga_profile=args.ga_profile, mem_profile=args.mem_profile, mem_profile_root=output_dir, ga_seed=args.seed,
+        ga_warm_start_dir=args.ga_warm_start, ga_warm_start_fraction=args.ga_warm_fraction, cache=cache,
+        max_steps=args.max_steps, timeout=args.timeout)
+    if cache is not None:
+        cache.close()
 
     df_resultados = pd.DataFrame(resultados)
     csv_path = os.path.join(output_dir, "resultados_benchmark.csv")
@@ -163,13 +424,15 @@ if __name__ == "__main__":
         vitorias = row['vitórias']
         mortes = row['mortes']
         sobrevivencias = row['sobreviveu']
+        tempo_esgotado = row['tempo_esgotado']
         tempo_total = row['tempo_total']
         tempo_medio = row['tempo_médio']
-        num_execucoes = vitorias + mortes + sobrevivencias
+        num_execucoes = vitorias + mortes + sobrevivencias + tempo_esgotado
 
         print(f"\n📊 RESULTADOS - Agente: {agente_nome.upper()} | Tamanho: {tamanho}x{tamanho}")
         print(f"🏆 Vitórias: {vitorias} ({(vitorias/num_execucoes)*100:.1f}%)")
         print(f"☠️ Mortes: {mortes} ({(mortes/num_execucoes)*100:.1f}%)")
         print(f"🤔 Sobreviveu sem vencer: {sobrevivencias} ({(sobrevivencias/num_execucoes)*100:.1f}%)")
+        print(f"⏰ Tempo esgotado: {tempo_esgotado} ({(tempo_esgotado/num_execucoes)*100:.1f}%)")
         print(f"⏱️ Tempo total: {tempo_total:.2f} segundos")
         print(f"⏱️ Tempo médio por execução: {tempo_medio:.3f} segundos")
\ No newline at end of file
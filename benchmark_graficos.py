@@ -15,39 +15,48 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from world.world import World
 from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
 from agents.genetic_agent import GeneticAgent
+from ga.seeding import run_seed_sequence
+from utils.watchdog import run_episode, STATUS_TEMPO_ESGOTADO, PASSOS_POR_CELULA
 
 # Dicionário que associa nomes de agentes às suas classes
 AGENTES_DISPONIVEIS = {
     'logico': LogicAgent,
+    'probabilistico': ProbabilisticAgent,
     'genetico': GeneticAgent
 }
 
-def executar_benchmark(agente_nome, world_size, num_execucoes):
+def executar_benchmark(agente_nome, world_size, num_execucoes, max_steps=None, timeout=None, ga_seed=0):
+    # max_steps e timeout limitam os passos e o tempo (segundos) de cada episódio (ver utils/watchdog.py)
     # Inicializa contadores de vitórias, mortes e sobrevivências
-    vitorias, mortes, sobrevivencias = 0, 0, 0
+    vitorias, mortes, sobrevivencias, tempo_esgotado = 0, 0, 0, 0
     tempos = []  # Lista para armazenar o tempo de cada execução
 
     # Executa o benchmark várias vezes, mudando a semente para cada rodada
     for i in range(num_execucoes):
         seed = i  # muda a semente em cada rodada para garantir variedade
         mundo = World(size=world_size, seed=seed)  # Cria o mundo com a semente atual
-        agente = AGENTES_DISPONIVEIS[agente_nome](mundo)  # Instancia o agente escolhido
-        agente.logger = None  # desativa logging
 
         # Marca o tempo de início da execução
         inicio = time.perf_counter()
-        agente.run()  # Executa o agente no mundo
+        # Executa o agente no mundo, encerrando o episódio ao esgotar passos ou tempo
+        # O agente genético usa um gerador próprio da execução, derivado de (ga_seed, agente, tamanho, índice)
+        agente_kwargs = {"seed_seq": run_seed_sequence(ga_seed, agente_nome, world_size, i)} \
+            if agente_nome == "genetico" else {}
+        mundo, _, status = run_episode(AGENTES_DISPONIVEIS[agente_nome], mundo, max_steps, timeout, **agente_kwargs)
         fim = time.perf_counter()  # Marca o tempo de fim da execução
 
         # Salva o tempo gasto nesta execução
         tempos.append(fim - inicio)
 
         # Atualiza os contadores de acordo com o resultado da execução
-        if mundo.won:
+        if status == "vitória":
             vitorias += 1
-        elif not mundo.is_alive:
+        elif status == "morte":
             mortes += 1
+        elif status == STATUS_TEMPO_ESGOTADO:
+            tempo_esgotado += 1
         else:
             sobrevivencias += 1
 
@@ -62,6 +71,7 @@ def executar_benchmark(agente_nome, world_size, num_execucoes):
         "vitórias": vitorias,
         "mortes": mortes,
         "sobreviveu": sobrevivencias,
+        "tempo_esgotado": tempo_esgotado,
         "tempo_total": tempo_total,
         "tempo_médio": tempo_medio
     }
@@ -101,13 +111,17 @@ if __name__ == "__main__":
     parser.add_argument("--sizes", nargs="+", type=int, default=[4, 6, 8])
     parser.add_argument("--agentes", nargs="+", choices=AGENTES_DISPONIVEIS.keys(),
                         default=list(AGENTES_DISPONIVEIS.keys()))
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help=f"Limite de passos por episódio (padrão: {PASSOS_POR_CELULA} × tamanho²; 0 = sem limite)")
+    parser.add_argument("--timeout", type=float, default=None, help="Tempo máximo por episódio em segundos")
     args = parser.parse_args()
 
     # Executa o benchmark para cada combinação de tamanho de mundo e agente selecionado
     resultados = []
     for size in args.sizes:
         for nome in args.agentes:
-            resultado = executar_benchmark(nome, size, args.execucoes)
+            resultado = executar_benchmark(nome, size, args.execucoes, max_steps=args.max_steps,
+                                           timeout=args.timeout)
             resultados.append(resultado)
 
     # Salva os resultados em um DataFrame do pandas
@@ -124,13 +138,16 @@ if __name__ == "__main__":
         vitorias = row['vitórias']
         mortes = row['mortes']
         sobrevivencias = row['sobreviveu']
+        tempo_esgotado = row['tempo_esgotado']
         tempo_total = row['tempo_total']
         tempo_medio = row['tempo_médio']
-        num_execucoes = vitorias + mortes + sobrevivencias
+        num_execucoes = vitorias + mortes + sobrevivencias + tempo_esgotado
 
         print(f"\n📊 RESULTADOS - Agente: {agente_nome.upper()} | Tamanho: {tamanho}x{tamanho}")
         print(f"🏆 Vitórias: {vitorias} ({(vitorias/num_execucoes)*100:.1f}%)")
         print(f"☠️ Mortes: {mortes} ({(mortes/num_execucoes)*100:.1f}%)")
         print(f"🤔 Sobreviveu sem vencer: {sobrevivencias} ({(sobrevivencias/num_execucoes)*100:.1f}%)")
+        if tempo_esgotado:
+            print(f"⏰ Tempo esgotado: {tempo_esgotado} ({(tempo_esgotado/num_execucoes)*100:.1f}%)")
         print(f"⏱️ Tempo total: {tempo_total:.2f} segundos")
         print(f"⏱️ Tempo médio por execução: {tempo_medio:.2f} segundos")
\ No newline at end of file
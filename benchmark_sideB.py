@@ -11,30 +11,33 @@ e exibe um resumo com as taxas de vitória, morte, sobrevivência e tempos médi
 import time
 from world.world import World
 from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
 from agents.genetic_agent import GeneticAgent
+from ga.seeding import run_seed_sequence
+from utils.cost_model import CostModel
+from utils.watchdog import run_episode, STATUS_TEMPO_ESGOTADO
 
 # Dicionário que associa nomes de agentes às suas classes
 AGENTES_DISPONIVEIS = {
     'logico': LogicAgent,
+    'probabilistico': ProbabilisticAgent,
     'genetico': GeneticAgent
 }
 
 NUM_EXECUCOES = 10  # Número de execuções para cada combinação agente + tamanho
 WORLD_SIZES = [4, 6, 8]  # Tamanhos de mundo a serem testados
 
-# Tempos médios estimados para cada agente (usado apenas para exibir estimativa)
-TEMPOS_MEDIOS_ESTIMADOS = {
-    'logico': 0.10,
-    'genetico': 0.30
-}
+# Modelo de custo: estima o tempo de cada execução a partir dos tempos já observados
+MODELO_CUSTO = CostModel()
 
-def executar_benchmark(agente_nome, world_size):
+def executar_benchmark(agente_nome, world_size, *, max_steps=None, timeout=None, ga_seed=0):
+    # max_steps e timeout limitam os passos e o tempo (segundos) de cada episódio (ver utils/watchdog.py)
     # Inicializa contadores de vitórias, mortes e sobrevivências
-    vitorias, mortes, sobrevivencias = 0, 0, 0
+    vitorias, mortes, sobrevivencias, tempo_esgotado = 0, 0, 0, 0
     tempos = []  # Lista para armazenar o tempo de cada execução
 
     # Calcula e exibe a estimativa de tempo total para o benchmark
-    tempo_estimado = TEMPOS_MEDIOS_ESTIMADOS.get(agente_nome, 0.2) * NUM_EXECUCOES
+    tempo_estimado = MODELO_CUSTO.estimate(agente_nome, world_size) * NUM_EXECUCOES
     print(f"\n🔁 Iniciando: agente = '{agente_nome}', mundo = {world_size}x{world_size}")
     print(f"⏳ Estimativa de tempo total: {tempo_estimado:.2f} segundos")
 
@@ -42,25 +45,32 @@ def executar_benchmark(agente_nome, world_size):
     for i in range(NUM_EXECUCOES):
         seed = i  # muda a semente em cada rodada para garantir variedade
         mundo = World(size=world_size, seed=seed)  # Cria o mundo com a semente atual
-        agente = AGENTES_DISPONIVEIS[agente_nome](mundo)       # Instancia o agente escolhido
-        agente.logger = None  # desativa logging para não poluir a saída
 
         # Exibe informações da execução atual
         print(f"🚀 Execução {i+1}/{NUM_EXECUCOES} [{agente_nome} - {world_size}x{world_size}]")
 
         # Marca o tempo de início da execução
         inicio = time.perf_counter()
-        agente.run()  # Executa o agente no mundo
+        # Executa o agente no mundo, encerrando o episódio ao esgotar passos ou tempo
+        # O agente genético usa um gerador próprio da execução, derivado de (ga_seed, agente, tamanho, índice)
+        agente_kwargs = {"seed_seq": run_seed_sequence(ga_seed, agente_nome, world_size, i)} \
+            if agente_nome == "genetico" else {}
+        mundo, _, status = run_episode(AGENTES_DISPONIVEIS[agente_nome], mundo, max_steps, timeout, **agente_kwargs)
         fim = time.perf_counter()  # Marca o tempo de fim da execução
 
-        # Salva o tempo gasto nesta execução
+        # Salva o tempo gasto nesta execução (também no histórico do modelo de custo,
+        # exceto quando o episódio foi interrompido: o tempo não representa a execução completa)
         tempos.append(fim - inicio)
+        if status != STATUS_TEMPO_ESGOTADO:
+            MODELO_CUSTO.record(agente_nome, world_size, fim - inicio)
 
         # Atualiza os contadores de acordo com o resultado da execução
-        if mundo.won:
+        if status == "vitória":
             vitorias += 1
-        elif not mundo.is_alive:
+        elif status == "morte":
             mortes += 1
+        elif status == STATUS_TEMPO_ESGOTADO:
+            tempo_esgotado += 1
         else:
             sobrevivencias += 1
 
@@ -73,6 +83,8 @@ def executar_benchmark(agente_nome, world_size):
     print(f"🏆 Vitórias: {vitorias} ({(vitorias/NUM_EXECUCOES)*100:.1f}%)")
     print(f"☠️ Mortes: {mortes} ({(mortes/NUM_EXECUCOES)*100:.1f}%)")
     print(f"🤔 Sobreviveu sem vencer: {sobrevivencias} ({(sobrevivencias/NUM_EXECUCOES)*100:.1f}%)")
+    if tempo_esgotado:
+        print(f"⏰ Tempo esgotado: {tempo_esgotado} ({(tempo_esgotado/NUM_EXECUCOES)*100:.1f}%)")
     print(f"⏱️ Tempo total real: {tempo_total:.2f} segundos")
     print(f"⏱️ Tempo médio por execução: {tempo_medio:.3f} segundos\n")
 
@@ -0,0 +1,127 @@
+# ==============================
+# ga/batch_eval.py
+# ==============================
+'''
+# Este arquivo implementa a avaliação vetorizada (NumPy) de uma população inteira do
+# algoritmo genético. Em vez de simular cada indivíduo com World.step, todos os agentes
+# avançam juntos, um gene por vez, usando operações sobre arrays (movimento, consulta
+# de poços/Wumpus em grades, máscaras de vivo/vencedor e acúmulo de pontuação).
+# O fitness retornado é idêntico ao calculado por Individual.evaluate.
+'''
+
+import functools
+
+import numpy as np
+
+from world.world import (
+    ACAO_CODIGO, CIMA, BAIXO, ESQUERDA, DIREITA, AGARRAR, TIRO,
+    FEDOR, BRILHO, World,
+)
+
+_NUM_CODIGOS = 256  # Qualquer valor uint8 é aceito; códigos fora de 0..5 não movem
+_MOVIMENTOS = {CIMA: (-1, 0), BAIXO: (1, 0), ESQUERDA: (0, -1), DIREITA: (0, 1)}
+
+# Recompensa de cada ação dada a máscara de percepção da célula de destino:
+# -0.5 por movimento, -1 pelas demais, +100 por AGARRAR com BRILHO e +25 por TIRO com FEDOR
+_RECOMPENSA = np.full((_NUM_CODIGOS, 8), -1.0)
+_RECOMPENSA[list(_MOVIMENTOS)] = -0.5
+for _mascara in range(8):
+    if _mascara & BRILHO:
+        _RECOMPENSA[AGARRAR, _mascara] += 100
+    if _mascara & FEDOR:
+        _RECOMPENSA[TIRO, _mascara] += 25
+
+
+@functools.lru_cache(maxsize=32)
+def _tabelas(layout):
+    """
+    Monta (uma vez por layout) as tabelas por célula usadas na simulação vetorizada.
+    As células usam índice plano x * size + y.
+    """
+    size = layout.size
+    num_celulas = size * size
+    wx, wy = layout.wumpus_pos
+    move = np.empty((num_celulas, _NUM_CODIGOS), dtype=np.intp)  # Célula de destino por ação
+    pit = np.zeros(num_celulas, dtype=bool)
+    gold = np.zeros(num_celulas, dtype=bool)
+    wumpus = np.zeros(num_celulas, dtype=bool)
+    adj_wumpus = np.zeros(num_celulas, dtype=bool)
+    percept = np.empty((2, num_celulas), dtype=np.intp)  # [wumpus_alive, célula]
+    for x in range(size):
+        for y in range(size):
+            c = x * size + y
+            move[c, :] = c
+            for codigo, (dx, dy) in _MOVIMENTOS.items():
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < size and 0 <= ny < size:
+                    move[c, codigo] = nx * size + ny
+            pit[c] = (x, y) in layout.pit_set
+            gold[c] = (x, y) == layout.gold_pos
+            wumpus[c] = (x, y) == layout.wumpus_pos
+            adj_wumpus[c] = abs(x - wx) + abs(y - wy) == 1
+            percept[0, c] = layout.percept_grid_morto[x][y]
+            percept[1, c] = layout.percept_grid_vivo[x][y]
+    return move, pit, gold, wumpus, adj_wumpus, percept
+
+
+def encode_chromosomes(chromosomes):
+    """
+    Converte cromossomos de strings ('CIMA', 'TIRO', ...) em uma matriz uint8 de códigos.
+    Ações desconhecidas viram 255 (não movem e custam -1, como em World.step).
+    :param chromosomes: Lista de cromossomos (listas de strings) de mesmo tamanho
+    :return: np.ndarray (pop_size, chrom_length) com dtype uint8
+    """
+    return np.array(
+        [[ACAO_CODIGO.get(gene, 255) for gene in chromosome] for chromosome in chromosomes],
+        dtype=np.uint8,
+    ).reshape(len(chromosomes), -1)
+
+
+def batch_evaluate(actions, world):
+    """
+    Avalia todos os cromossomos de uma vez no mesmo mundo.
+    :param actions: Matriz (pop_size, chrom_length) de códigos de ação (uint8)
+    :param world: World (parte do seu estado atual) ou WorldLayout (parte do estado inicial)
+    :return: np.ndarray float64 (pop_size,) com o fitness de cada indivíduo
+    """
+    actions = np.asarray(actions)
+    if isinstance(world, World):
+        layout = world.layout
+        (ax, ay), start_alive, start_wumpus_alive, _, _ = world.snapshot()
+    else:
+        layout = world
+        (ax, ay), start_alive, start_wumpus_alive = (0, 0), True, True
+
+    pop_size, chrom_length = actions.shape
+    size = layout.size
+
+    move, pit, gold, wumpus, adj_wumpus, percept = _tabelas(layout)
+
+    # Estado de todos os agentes
+    cols = np.ascontiguousarray(actions.T)  # Uma linha por gene
+    pos = np.full(pop_size, ax * size + ay, dtype=np.intp)
+    wumpus_alive = np.full(pop_size, start_wumpus_alive, dtype=bool)
+    alive = np.full(pop_size, start_alive, dtype=bool)
+    active = np.ones(pop_size, dtype=bool)  # Ainda simulando (não morreu durante o episódio)
+    score = np.zeros(pop_size, dtype=np.float64)
+
+    for g in range(chrom_length):
+        a = cols[g]
+        # Movimento (limitado às bordas do mundo)
+        pos = move[pos, a]
+        # Tiro em Wumpus adjacente
+        wumpus_alive &= ~((a == TIRO) & adj_wumpus[pos])
+        # Morte por Wumpus ou poço (pegar o ouro encerra a interação sem checar mortes)
+        grab = (a == AGARRAR) & gold[pos]
+        died = active & ~grab & (pit[pos] | (wumpus[pos] & wumpus_alive))
+        # Pontuação: -100 para quem morreu agora, recompensa da ação para quem segue ativo
+        active &= ~died
+        reward = _RECOMPENSA[a, percept[wumpus_alive.view(np.uint8), pos]]
+        score += np.where(died, -100.0, np.where(active, reward, 0.0))
+        alive &= ~died
+        if not active.any():
+            break
+
+    # Pequeno bônus por sobrevivência
+    score[alive] += 10
+    return score
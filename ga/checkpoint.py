@@ -0,0 +1,42 @@
+# ==============================
+# ga/checkpoint.py
+# ==============================
+'''
+# Este arquivo implementa a gravação e leitura de checkpoints em disco do algoritmo
+# genético. O estado é salvo em um único arquivo .npz com arrays binários (população
+# em códigos uint8, fitness e históricos) e um pequeno bloco de metadados em JSON
+# (geração, estado dos geradores aleatórios, contadores). A escrita é atômica: o
+# arquivo é gravado em um temporário e depois renomeado.
+'''
+
+import json
+import os
+
+import numpy as np
+
+
+def save_run_state(path, arrays, meta):
+    """
+    Grava um checkpoint.
+    :param path: Caminho do arquivo (.npz)
+    :param arrays: Dicionário nome → array NumPy
+    :param meta: Dicionário serializável em JSON
+    """
+    pasta = os.path.dirname(path)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = path + ".tmp"
+    with open(temporario, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(temporario, path)
+
+
+def load_run_state(path):
+    """
+    Lê um checkpoint gravado por save_run_state.
+    :return: (arrays, meta)
+    """
+    with np.load(path, allow_pickle=False) as dados:
+        arrays = {nome: dados[nome] for nome in dados.files if nome != "meta"}
+        meta = json.loads(str(dados["meta"]))
+    return arrays, meta
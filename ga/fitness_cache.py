@@ -0,0 +1,60 @@
+# ==============================
+# ga/fitness_cache.py
+# ==============================
+'''
+# Este arquivo implementa a classe FitnessCache, um cache limitado (LRU) de valores de
+# fitness usado pelo GeneticAlgorithm. Como a avaliação é determinística para um mesmo
+# cromossomo no mesmo mundo, indivíduos repetidos (elites, cópias sem mutação) não
+# precisam ser simulados de novo. Mantém contadores de acertos, falhas e remoções.
+'''
+
+from collections import OrderedDict
+
+class FitnessCache:
+    def __init__(self, max_size):
+        # Número máximo de entradas antes de remover as menos usadas recentemente
+        self.max_size = max_size
+        self._data = OrderedDict()
+        # Contadores reportados no resultado do GA
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Busca o fitness de uma chave (mundo + cromossomo).
+        :return: Fitness armazenado ou None se não estiver no cache
+        """
+        fitness = self._data.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key, fitness):
+        """
+        Armazena o fitness de uma chave, removendo a entrada mais antiga se o cache estiver cheio.
+        """
+        self._data[key] = fitness
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Retorna os contadores do cache em um dicionário.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._data)
@@ -6,18 +6,60 @@
 # evoluir e selecionar populações de indivíduos (soluções), aplicando operadores de
 # seleção, cruzamento e mutação para buscar sequências de ações que maximizem o desempenho
 # do agente no ambiente. Serve como base para experimentos de IA evolutiva no projeto.
+# Também define ArrayGeneticAlgorithm, que guarda a população como uma matriz NumPy uint8
+# e aplica todos os operadores de forma vetorizada.
 
 import copy
+from itertools import chain, repeat
+import json
 import random
+import time
 import psutil
 import os
 import numpy as np
 
 # Importa a classe Individual (representa um possível agente/solução)
 from .individual import Individual
+from .batch_eval import batch_evaluate
+from .kernel import kernel_evaluate
+from .fitness_cache import FitnessCache
+from .history import HistoryBuffer
+from .timing import PhaseTimer
+from .checkpoint import save_run_state, load_run_state
+from .population_store import PopulationStore
+from .parallel_eval import PoolEvaluator, EXECUTORES, encode_genome, decode_genome
+from world.world import ACOES, ACAO_CODIGO
+from utils.memory_profiler import MemoryProfiler
+
+
+def locus_diversity(matriz):
+    """
+    Calcula a diversidade por posição (locus) de uma população codificada.
+    Códigos fora de ACOES são agrupados em um único símbolo extra.
+    :param matriz: Matriz inteira (indivíduos, genes) com os códigos das ações
+    :return: (genes distintos por posição, entropia de Shannon em bits por posição)
+    """
+    n_simbolos = len(ACOES) + 1
+    n, comprimento = matriz.shape
+    codigos = np.minimum(matriz, len(ACOES)).astype(np.intp)
+    # Contagem de cada símbolo em cada posição com um único bincount: índice = locus * n_simbolos + código
+    indices = codigos + np.arange(comprimento, dtype=np.intp) * n_simbolos
+    contagens = np.bincount(indices.ravel(), minlength=comprimento * n_simbolos).reshape(comprimento, n_simbolos)
+    distintos = np.count_nonzero(contagens, axis=1)
+    p = contagens / max(n, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropia = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+    return distintos, entropia
+
 
 class GeneticAlgorithm:
-    def __init__(self, pop_size, gens, chrom_length, mutation_rate, crossover_rate):
+    def __init__(self, pop_size, gens, chrom_length, mutation_rate, crossover_rate, cache_size=4096,
+                 checkpoint_every=0, n_workers=1, executor='process', stagnation_window=None,
+                 stagnation_tol=0.0, target_fitness=None, max_evaluations=None, time_budget=None,
+                 save_path=None, save_interval=10, diversity_every=1, history_max_rows=None,
+                 history_dir=None, profile_phases=False,
+                 memory_profile_every=None, memory_report_path=None, rng=None,
+                 kernel=False, warm_start_dir=None, warm_start_fraction=1.0):
         # Tamanho da população de indivíduos
         self.pop_size = pop_size
         # Número de gerações (iterações do algoritmo)
@@ -28,127 +70,647 @@ class GeneticAlgorithm:
         self.mutation_rate = mutation_rate
         # Taxa de cruzamento padrão
         self.crossover_rate = crossover_rate
-        # Histórico do fitness médio, máximo e mínimo por geração
-        self.fitness_history = []  # Lista de dicionários: {'min': x, 'mean': y, 'max': z}
+        # Os históricos são arrays pré-alocados (ver ga/history.py). history_max_rows limita as
+        # linhas mantidas em RAM (dizimação) e history_dir grava os históricos largos completos
+        # em arquivos .npy mapeados em memória (fitness_pop.npy, diversidade.npy, entropia.npy).
+        self.history_max_rows = history_max_rows
+        self.history_dir = history_dir
+        spill = (lambda nome: os.path.join(history_dir, nome + ".npy")) if history_dir else (lambda nome: None)
+        # Histórico do fitness mínimo, médio e máximo por geração (completo, colunas min/mean/max)
+        self.fitness_history = HistoryBuffer(gens, 3, np.float64)
         # Histórico do fitness de toda a população por geração (para gráficos avançados)
-        self.fitness_pop = []
+        self.fitness_pop = HistoryBuffer(gens, pop_size, np.float32, history_max_rows, spill("fitness_pop"))
         # Histórico de uso de memória por geração
-        self.memory_history = []
+        self.memory_history = HistoryBuffer(gens, None, np.float32, history_max_rows)
         # Histórico de uso de CPU por geração
-        self.cpu_history = []
-        # Diversidade de genes por posição no cromossomo
-        self.diversidade_history = []
+        self.cpu_history = HistoryBuffer(gens, None, np.float32, history_max_rows)
+        # Diversidade de genes por posição no cromossomo (amostrada a cada diversity_every gerações;
+        # 0 ou None desativa). entropia_history guarda a entropia por posição das mesmas amostras.
+        self.diversity_every = diversity_every
+        amostras = -(-gens // diversity_every) if diversity_every else 0
+        self.diversidade_history = HistoryBuffer(amostras, chrom_length, np.int16, history_max_rows, spill("diversidade"))
+        self.entropia_history = HistoryBuffer(amostras, chrom_length, np.float32, history_max_rows, spill("entropia"))
+        # Cache de fitness por (mundo, cromossomo); cache_size=0 desativa
+        self.fitness_cache = FitnessCache(cache_size) if cache_size > 0 else None
+        # Intervalo (em genes) dos checkpoints usados para retomar a simulação de um prefixo comum; 0 desativa.
+        # Opcional: com os parâmetros padrão o custo de gravar os snapshots anula o ganho
+        self.checkpoint_every = checkpoint_every
+        # Avaliação paralela: 'serial', 'thread' ou 'process' (usado quando n_workers > 1)
+        if executor not in EXECUTORES:
+            raise ValueError(f"Executor inválido: {executor!r} (opções: {', '.join(EXECUTORES)})")
+        self.n_workers = n_workers
+        self.executor = executor
+        self.pool = None  # PoolEvaluator ativo durante run()
+        # kernel=True avalia com o kernel de simulação de ga/kernel.py (Numba, se instalado)
+        self.kernel = kernel
+        # Critérios de parada antecipada (None desativa cada um):
+        # - stagnation_window: gerações sem melhora (> stagnation_tol) do fitness máximo ou médio
+        # - target_fitness: fitness máximo a ser atingido
+        # - max_evaluations: número máximo de simulações de fitness
+        # - time_budget: tempo de execução máximo em segundos
+        self.stagnation_window = stagnation_window
+        self.stagnation_tol = stagnation_tol
+        self.target_fitness = target_fitness
+        self.max_evaluations = max_evaluations
+        self.time_budget = time_budget
+        # Número de simulações de fitness realizadas (acertos de cache não contam)
+        self.evaluations = 0
+        # Gerador dos operadores genéticos: random.Random próprio (ver ga/seeding.py) ou,
+        # se omitido, o módulo random global
+        self.rng = rng if rng is not None else random
+        # Checkpoint em disco (.npz) gravado a cada save_interval gerações; None desativa
+        self.save_path = save_path
+        self.save_interval = save_interval
+        # Tempo por fase de cada geração (ver ga/timing.py); desativado não mede nada
+        self.timer = PhaseTimer(gens) if profile_phases else None
+        if self.timer is not None:
+            self._instrument()
+        # Perfil de memória com tracemalloc: snapshot a cada memory_profile_every gerações
+        # e relatório em memory_report_path (None desativa; o tracemalloc deixa a execução mais lenta)
+        self.memory_profile_every = memory_profile_every
+        self.memory_report_path = memory_report_path
+        self.memory_profile = None
+        # Warm start (ver ga/population_store.py): a população final é gravada em warm_start_dir e
+        # uma execução seguinte no mesmo mundo parte dos warm_start_fraction melhores indivíduos
+        # salvos (1.0 = reutiliza a população inteira; o restante é completado com aleatórios)
+        self.population_store = PopulationStore(warm_start_dir) if warm_start_dir else None
+        self.warm_start_fraction = warm_start_fraction
 
-    def run(self, world, logger=None):
+    def run(self, world, logger=None, resume_from=None):
+        # resume_from: caminho de um checkpoint gravado por save_path, para continuar a execução
+        # Cria o pool de workers (persistente durante todas as gerações), se configurado
+        if self.n_workers > 1 and self.executor != 'serial':
+            self.pool = PoolEvaluator(world, self.n_workers, self.executor, kernel=self.kernel)
+        try:
+            return self._run(world, logger, resume_from)
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+    def _run(self, world, logger, resume_from=None):
         # Registra o uso de memória e CPU antes de iniciar as gerações
         process = psutil.Process(os.getpid())
         process.cpu_percent()
+        stop_reason, stop_generation = 'max_gens', self.gens
+        profiler = self.start_memory_profile()
 
-        # Cria a população inicial de indivíduos aleatórios
-        population = [Individual(self.chrom_length) for _ in range(self.pop_size)]
-        for g in range(self.gens):
-            # Uso de memória em MB
-            memory_mb = process.memory_info().rss / (1024 * 1024)
-            self.memory_history.append(memory_mb)
-            # Uso de CPU em porcentagem
-            self.cpu_history.append(process.cpu_percent())
-            
-            # Avalia o fitness de cada indivíduo na população
-            for ind in population:
-                ind.evaluate(world)
-
-            # Ordena a população do melhor para o pior fitness
-            population.sort(key=lambda x: x.fitness, reverse=True)
-
-            diversidade_geracao = []
-            # Para cada posição no cromossomo (cada variável)
-            for i in range(self.chrom_length):
-                # Encontra o número de genes únicos nessa posição em toda a população
-                genes_na_posicao = set(ind.chromosome[i] for ind in population)
-                diversidade_geracao.append(len(genes_na_posicao))
-            self.diversidade_history.append(diversidade_geracao)
-
-            # Coleta estatísticas de fitness para gráficos
-            fitness_vals = [ind.fitness for ind in population]
-            self.fitness_history.append({
-                'min': min(fitness_vals),
-                'mean': sum(fitness_vals) / len(fitness_vals),
-                'max': max(fitness_vals)
-            })
-            self.fitness_pop.append(fitness_vals.copy())
+        if resume_from is not None:
+            # Continua de um checkpoint: população, históricos, geradores e contadores
+            population, progresso = self.load_checkpoint(resume_from, world)
+            if logger:
+                logger.write(f"[GA] Retomando da geração {progresso['geracao'] + 1} ({resume_from})")
+        else:
+            # Cria a população inicial de indivíduos aleatórios (ou parte de uma população salva)
+            population = self.initial_population()
+            if self.population_store is not None:
+                population = self.warm_start(population, world, logger)
+            progresso = {'geracao': 0, 'melhor_max': None, 'melhor_media': None,
+                         'ultima_melhora': 0, 'tempo_decorrido': 0.0}
+        inicio = time.perf_counter() - progresso['tempo_decorrido']
+        melhor_max, melhor_media = progresso['melhor_max'], progresso['melhor_media']
+        ultima_melhora = progresso['ultima_melhora']
+
+        for g in range(progresso['geracao'], self.gens):
+            # Avalia, ordena e registra os históricos da geração
+            population, fitness_vals = self.evaluate_generation(population, world, process)
 
             # Logging da geração
+            if self.timer:
+                self.timer.mark()
             if logger:
                 logger.write(f"[GA] Geração {g+1}: min={min(fitness_vals)}, mean={sum(fitness_vals)/len(fitness_vals):.2f}, max={max(fitness_vals)}")
-            
-            # Elitismo: mantém os dois melhores indivíduos da geração atual
-            next_gen = population[:2]
-            
-            # Preenche o restante da próxima geração com cruzamento e mutação
-            while len(next_gen) < self.pop_size:
-                # Seleciona dois pais para cruzamento
-                p1, p2 = self.select(population), self.select(population)
-                # Verifica se a taxa de cruzamento é atingida
-                if random.random() < self.crossover_rate:
-                    # Realiza o cruzamento (crossover) para gerar dois filhos
-                    c1, c2 = self.crossover(p1, p2)
-                else:
-                    # Se não cruzar, copia os pais diretamente
-                    c1, c2 = copy.deepcopy(p1), copy.deepcopy(p2)
-
-                # Aplica mutação nos filhos
-                self.mutate(c1)
-                self.mutate(c2)
-                # Adiciona os filhos à próxima geração
-                next_gen.extend([c1, c2])
-            
-            # Atualiza a população para a próxima geração
-            population = next_gen[:self.pop_size]  # Garante tamanho correto
+            if self.timer:
+                self.timer.lap('log')
 
-        # Avalia todos da última geração (caso tenha novos filhos não avaliados)
-        for ind in population:
-            if ind.fitness is None:
-                ind.evaluate(world)
+            # Critérios de parada antecipada
+            stats = self.last_stats()
+            if melhor_max is None or stats['max'] > melhor_max + self.stagnation_tol \
+                    or stats['mean'] > melhor_media + self.stagnation_tol:
+                ultima_melhora = g
+            melhor_max = stats['max'] if melhor_max is None else max(melhor_max, stats['max'])
+            melhor_media = stats['mean'] if melhor_media is None else max(melhor_media, stats['mean'])
+            motivo = self.stop_reason(stats, g - ultima_melhora, time.perf_counter() - inicio)
+            if motivo is not None and g + 1 < self.gens:
+                stop_reason, stop_generation = motivo, g + 1
+                if logger:
+                    logger.write(f"[GA] Parada antecipada na geração {g+1}: {motivo}")
+                break
 
-        # Salva o melhor indivíduo encontrado
-        best_individual = max(population, key=lambda x: x.fitness)
+            # Elitismo, seleção, cruzamento e mutação
+            population = self.next_generation(population)
+
+            # Checkpoint periódico em disco (estado pronto para a geração g + 2)
+            if self.save_path and (g + 1) % self.save_interval == 0 and g + 1 < self.gens:
+                self.save_checkpoint(self.save_path, population, world, {
+                    'geracao': g + 1, 'melhor_max': melhor_max, 'melhor_media': melhor_media,
+                    'ultima_melhora': ultima_melhora, 'tempo_decorrido': time.perf_counter() - inicio
+                })
+
+            if profiler and (g + 1) % self.memory_profile_every == 0:
+                profiler.sample(f"geração {g + 1}")
+
+        # Avalia todos da última geração (caso tenha novos filhos não avaliados)
+        best_individual, final_population_chromosomes = self.finalize(population, world)
         best_individual_fitness = best_individual.fitness
-        final_population_chromosomes = [ind.chromosome for ind in population]
+        if self.population_store is not None:
+            self.store_population(population, world)
+        if profiler:
+            self.memory_profile = profiler.finish()
+            if logger and self.memory_report_path:
+                logger.write(f"[GA] Relatório de memória (tracemalloc) salvo em: {self.memory_report_path}")
 
         # Logging final
         if logger:
             logger.write(f"[GA] Fim das gerações. Melhor fitness: {best_individual_fitness}")
-        
+
+        return self.build_result(best_individual, final_population_chromosomes, stop_reason, stop_generation)
+
+    def evaluate_generation(self, population, world, process):
+        """
+        Executa a parte de avaliação de uma geração: mede memória/CPU, avalia, ordena
+        e registra fitness e diversidade nos históricos.
+        :return: (população ordenada, lista de fitness ordenada)
+        """
+        # Uso de memória em MB
+        memory_mb = process.memory_info().rss / (1024 * 1024)
+        self.memory_history.append(memory_mb)
+        # Uso de CPU em porcentagem
+        self.cpu_history.append(process.cpu_percent())
+
+        geracao = len(self.fitness_history)
+        t = self.timer
+        if t:
+            t.begin(geracao)
+            avaliacoes_antes = self.evaluations
+
+        # Avalia o fitness de cada indivíduo na população
+        fitness = self.evaluate(population, world)
+        if t:
+            t.lap('avaliacao')
+            t.count(self.evaluations - avaliacoes_antes)
+
+        # Ordena a população do melhor para o pior fitness
+        population, fitness_vals = self.sort(population, fitness)
+        if t:
+            t.lap('ordenacao')
+
+        # Número de genes distintos e entropia em cada posição do cromossomo (amostrados)
+        if self.diversity_every and geracao % self.diversity_every == 0:
+            distintos, entropia = self.diversity(population)
+            self.diversidade_history.append(distintos, geracao)
+            self.entropia_history.append(entropia, geracao)
+            if t:
+                t.lap('diversidade')
+
+        # Coleta estatísticas de fitness para gráficos
+        self.fitness_history.append((
+            min(fitness_vals),
+            sum(fitness_vals) / len(fitness_vals),
+            max(fitness_vals)
+        ))
+        self.fitness_pop.append(fitness_vals)
+        return population, fitness_vals
+
+    def start_memory_profile(self):
+        # Inicia o perfil de memória, se configurado
+        if not self.memory_profile_every:
+            return None
+        profiler = MemoryProfiler(self.memory_report_path)
+        profiler.start()
+        return profiler
+
+    def _instrument(self):
+        # Os operadores são chamados por indivíduo: mede cada chamada (só quando ativado)
+        self.select = self.timer.wrap('selecao', self.select)
+        self.crossover = self.timer.wrap('cruzamento', self.crossover)
+        self.mutate = self.timer.wrap('mutacao', self.mutate)
+
+    def last_stats(self):
+        # Estatísticas de fitness da última geração avaliada
+        minimo, media, maximo = self.fitness_history.last().tolist()
+        return {'min': minimo, 'mean': media, 'max': maximo}
+
+    def history_buffers(self):
+        # Históricos por nome (mesmos nomes usados nos checkpoints)
         return {
-            "best": best_individual,
             "fitness_history": self.fitness_history,
             "fitness_pop": self.fitness_pop,
-            "final_pop": final_population_chromosomes,
             "memoria": self.memory_history,
             "cpu": self.cpu_history,
-            "diversidade_vars": np.array(self.diversidade_history)
+            "diversidade": self.diversidade_history,
+            "entropia": self.entropia_history,
         }
 
+    def save_checkpoint(self, path, population, world, progresso):
+        """
+        Grava em disco o estado necessário para continuar a execução exatamente deste ponto.
+        :param progresso: Geração seguinte e variáveis dos critérios de parada
+        """
+        matriz, fitness = self.population_arrays(population)
+        arrays = {"population": matriz, "fitness": fitness}
+        historicos = {}
+        for nome, buffer in self.history_buffers().items():
+            dados, geracoes, historicos[nome] = buffer.state()
+            arrays[nome] = dados
+            arrays[nome + "_geracoes"] = geracoes
+            if len(buffer):
+                arrays[nome + "_ultima"] = buffer.last()
+        meta = dict(progresso, rng=self.rng_state(), evaluations=self.evaluations, historicos=historicos,
+                    world=[list(world.layout.fingerprint()), list(world.snapshot())])
+        save_run_state(path, arrays, meta)
+
+    def load_checkpoint(self, path, world):
+        """
+        Lê um checkpoint e restaura históricos, geradores e contadores.
+        :return: (população, progresso)
+        """
+        arrays, meta = load_run_state(path)
+        mundo_salvo = meta.pop('world')
+        if mundo_salvo != json.loads(json.dumps([list(world.layout.fingerprint()), list(world.snapshot())])):
+            raise ValueError(f"O checkpoint {path} foi gravado para outro mundo")
+        historicos = meta.pop('historicos')
+        for nome, buffer in self.history_buffers().items():
+            buffer.restore(arrays[nome], arrays[nome + "_geracoes"], historicos[nome], arrays.get(nome + "_ultima"))
+        self.evaluations = meta.pop('evaluations')
+        self.set_rng_state(meta.pop('rng'))
+        return self.population_from_arrays(arrays["population"], arrays["fitness"]), meta
+
+    def population_arrays(self, population):
+        # População como matriz uint8 de códigos + fitness (NaN = ainda não avaliado)
+        matriz = np.array([list(encode_genome(ind.chromosome)) for ind in population], dtype=np.uint8)
+        fitness = np.array([np.nan if ind.fitness is None else ind.fitness for ind in population], dtype=np.float64)
+        return matriz.reshape(len(population), -1), fitness
+
+    def population_from_arrays(self, matriz, fitness):
+        return [
+            Individual.from_chromosome(decode_genome(linha), None if np.isnan(f) else f)
+            for linha, f in zip(map(bytes, matriz), fitness.tolist())
+        ]
+
+    def store_params(self):
+        # Parâmetros do GA que fazem parte da chave das populações salvas
+        return {'pop_size': self.pop_size, 'chrom_length': self.chrom_length,
+                'mutation_rate': self.mutation_rate, 'crossover_rate': self.crossover_rate}
+
+    def warm_start(self, population, world, logger=None):
+        """
+        Substitui os primeiros indivíduos da população aleatória pelos melhores da
+        população salva para este mundo (se houver). Os semeados são reavaliados.
+        :return: População inicial
+        """
+        salva = self.population_store.load(world, self.store_params())
+        if salva is None:
+            return population
+        matriz = salva[0][:min(self.pop_size, round(self.warm_start_fraction * self.pop_size))]
+        if logger:
+            logger.write(f"[GA] Warm start: {len(matriz)} indivíduos de {self.population_store.path(world, self.store_params())}")
+        semeados = self.population_from_arrays(matriz, np.full(len(matriz), np.nan))
+        return self.replace_head(population, semeados)
+
+    def replace_head(self, population, semeados):
+        return semeados + population[len(semeados):]
+
+    def store_population(self, population, world):
+        # Grava a população final (já avaliada por finalize) para warm starts futuros
+        self.population_store.save(world, self.store_params(), *self.population_arrays(population))
+
+    def rng_state(self):
+        # Estado do gerador usado pelos operadores
+        versao, estado, gauss = self.rng.getstate()
+        return [versao, list(estado), gauss]
+
+    def set_rng_state(self, state):
+        versao, estado, gauss = state
+        self.rng.setstate((versao, tuple(estado), gauss))
+
+    def build_result(self, best_individual, final_population_chromosomes, stop_reason, stop_generation):
+        # Monta o dicionário de resultado do GA a partir dos históricos acumulados
+        # (fecha os arquivos .npy dos históricos, se houver)
+        for buffer in self.history_buffers().values():
+            buffer.close()
+        return {
+            "best": best_individual,
+            "fitness_history": [
+                {'min': minimo, 'mean': media, 'max': maximo}
+                for minimo, media, maximo in self.fitness_history.array().tolist()
+            ],
+            # fitness_pop é um array (linhas mantidas em RAM) e fitness_pop_geracoes o índice de cada linha
+            "fitness_pop": self.fitness_pop.array(),
+            "fitness_pop_geracoes": self.fitness_pop.geracoes(),
+            "fitness_final": self.fitness_pop.last().tolist() if len(self.fitness_pop) else [],
+            "final_pop": final_population_chromosomes,
+            "memoria": self.memory_history.array().tolist(),
+            "cpu": self.cpu_history.array().tolist(),
+            "diversidade_vars": self.diversidade_history.array(),
+            "entropia_vars": self.entropia_history.array(),
+            "diversidade_geracoes": self.diversidade_history.geracoes(),
+            "historico_dir": self.history_dir,
+            # Tempos por fase (segundos por geração), avaliações e avaliações/s; None se desativado
+            "tempos": self.timer.result() if self.timer else None,
+            # Perfil de memória por tracemalloc (amostras, pico, maiores crescimentos); None se desativado
+            "memoria_tracemalloc": self.memory_profile,
+            "cache": self.fitness_cache.stats() if self.fitness_cache is not None else None,
+            "stop_reason": stop_reason,
+            "stop_generation": stop_generation,
+            "evaluations": self.evaluations
+        }
+
+    def stop_reason(self, stats, geracoes_sem_melhora, tempo_decorrido):
+        # Retorna o motivo da parada antecipada, ou None para continuar
+        if self.target_fitness is not None and stats['max'] >= self.target_fitness:
+            return 'target_fitness'
+        if self.stagnation_window is not None and geracoes_sem_melhora >= self.stagnation_window:
+            return 'stagnation'
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return 'max_evaluations'
+        if self.time_budget is not None and tempo_decorrido >= self.time_budget:
+            return 'time_budget'
+        return None
+
+    # --- Operações sobre a população (sobrescritas por ArrayGeneticAlgorithm) ---
+
+    def initial_population(self):
+        # Cria a população inicial de indivíduos aleatórios
+        return [Individual(self.chrom_length, self.rng) for _ in range(self.pop_size)]
+
+    def evaluate(self, population, world):
+        # Avalia o fitness de cada indivíduo na população
+        if self.pool is not None or self.kernel:
+            return self._evaluate_batched(population, world)
+        cache = self.fitness_cache
+        if cache is None:
+            for ind in population:
+                ind.evaluate(world, self.checkpoint_every)
+            self.evaluations += len(population)
+        else:
+            world_key = self.world_key(world)
+            for ind in population:
+                key = (world_key, tuple(ind.chromosome))
+                fitness = cache.get(key)
+                if fitness is None:
+                    ind.evaluate(world, self.checkpoint_every)
+                    self.evaluations += 1
+                    cache.put(key, ind.fitness)
+                else:
+                    ind.fitness = fitness
+        return [ind.fitness for ind in population]
+
+    def _evaluate_batched(self, population, world):
+        # Agrupa cromossomos repetidos, consulta o cache e avalia só os que faltam em lote
+        # (no pool de workers ou com o kernel de simulação)
+        cache = self.fitness_cache
+        world_key = self.world_key(world) if cache is not None else None
+        unicos = {}
+        for ind in population:
+            unicos.setdefault(tuple(ind.chromosome), []).append(ind)
+        faltando = []
+        for chave, inds in unicos.items():
+            fitness = cache.get((world_key, chave)) if cache is not None else None
+            if fitness is None:
+                faltando.append(chave)
+            else:
+                for ind in inds:
+                    ind.fitness = fitness
+        genomas = [encode_genome(chave) for chave in faltando]
+        if self.pool is not None:
+            valores = self.pool.evaluate(genomas)
+        else:
+            matriz = np.frombuffer(b''.join(genomas), dtype=np.uint8).reshape(len(genomas), self.chrom_length)
+            valores = kernel_evaluate(matriz, world).tolist()
+        self.evaluations += len(faltando)
+        for chave, fitness in zip(faltando, valores):
+            for ind in unicos[chave]:
+                ind.fitness = fitness
+            if cache is not None:
+                cache.put((world_key, chave), fitness)
+        return [ind.fitness for ind in population]
+
+    def world_key(self, world):
+        # Identifica o mundo (layout + estado do episódio) para as chaves do cache de fitness
+        return (world.layout.fingerprint(), world.snapshot())
+
+    def sort(self, population, fitness):
+        # Ordena a população do melhor para o pior fitness
+        population.sort(key=lambda x: x.fitness, reverse=True)
+        return population, [ind.fitness for ind in population]
+
+    def diversity(self, population):
+        # Codifica a população em uma matriz de códigos (255 = gene desconhecido) e calcula a diversidade por posição
+        genes = chain.from_iterable(ind.chromosome for ind in population)
+        codigos = np.fromiter(map(ACAO_CODIGO.get, genes, repeat(255)), dtype=np.uint8,
+                              count=len(population) * self.chrom_length)
+        return locus_diversity(codigos.reshape(len(population), self.chrom_length))
+
+    def next_generation(self, population):
+        # Elitismo: mantém os dois melhores indivíduos da geração atual
+        next_gen = population[:2]
+
+        # Preenche o restante da próxima geração com cruzamento e mutação
+        while len(next_gen) < self.pop_size:
+            # Seleciona dois pais para cruzamento
+            p1, p2 = self.select(population), self.select(population)
+            # Verifica se a taxa de cruzamento é atingida
+            if self.rng.random() < self.crossover_rate:
+                # Realiza o cruzamento (crossover) para gerar dois filhos
+                c1, c2 = self.crossover(p1, p2)
+            else:
+                # Se não cruzar, copia os pais diretamente
+                c1, c2 = copy.deepcopy(p1), copy.deepcopy(p2)
+
+            # Aplica mutação nos filhos
+            self.mutate(c1)
+            self.mutate(c2)
+            # Adiciona os filhos à próxima geração
+            next_gen.extend([c1, c2])
+
+        # Atualiza a população para a próxima geração
+        return next_gen[:self.pop_size]  # Garante tamanho correto
+
+    def finalize(self, population, world):
+        # Avalia os indivíduos ainda não avaliados e retorna (melhor, cromossomos finais)
+        pendentes = [ind for ind in population if ind.fitness is None]
+        if pendentes:
+            self.evaluate(pendentes, world)
+        best_individual = max(population, key=lambda x: x.fitness)
+        return best_individual, [ind.chromosome for ind in population]
+
+    def emigrants(self, population, fitness_vals, k):
+        # Os k melhores indivíduos (população ordenada) no formato de troca (bytes, fitness)
+        return [(encode_genome(ind.chromosome), ind.fitness) for ind in population[:k]]
+
+    def receive(self, population, fitness_vals, imigrantes):
+        # Substitui os piores indivíduos pelos imigrantes (fitness já conhecido) e reordena
+        novos = [Individual.from_chromosome(decode_genome(genome), fitness) for genome, fitness in imigrantes]
+        if novos:
+            population = population[:len(population) - len(novos)] + novos
+        return self.sort(population, None)
+
     def select(self, population):
         # Seleciona aleatoriamente um indivíduo entre os 10 melhores (elitismo/seleção por torneio)
-        return copy.deepcopy(random.choice(population[:10]))
+        return copy.deepcopy(self.rng.choice(population[:10]))
 
     def crossover(self, p1, p2):
         # Realiza o cruzamento de dois pais para gerar dois filhos
-        point = random.randint(1, self.chrom_length - 1)  # Ponto de corte aleatório
-        c1 = Individual(self.chrom_length)
-        c2 = Individual(self.chrom_length)
+        point = self.rng.randint(1, self.chrom_length - 1)  # Ponto de corte aleatório
+        c1 = Individual(self.chrom_length, self.rng)
+        c2 = Individual(self.chrom_length, self.rng)
         # Combina partes dos cromossomos dos pais para formar os filhos
         c1.chromosome = p1.chromosome[:point] + p2.chromosome[point:]
         c2.chromosome = p2.chromosome[:point] + p1.chromosome[point:]
+        # Cada filho compartilha com um dos pais o prefixo até o ponto de corte
+        c1.inherit_checkpoints(p1, point)
+        c2.inherit_checkpoints(p2, point)
         return c1, c2
 
     def mutate(self, individual):
+        primeiro_alterado = None
         for i in range(self.chrom_length):
             # Aplica mutação com base na taxa de mutação
-            if random.random() < self.mutation_rate:
-                individual.chromosome[i] = self.random_action()
-        
+            if self.rng.random() < self.mutation_rate:
+                novo = self.random_action()
+                if novo != individual.chromosome[i] and primeiro_alterado is None:
+                    primeiro_alterado = i
+                individual.chromosome[i] = novo
+        # Checkpoints posteriores ao primeiro gene alterado deixam de valer
+        if primeiro_alterado is not None:
+            individual.invalidate_checkpoints(primeiro_alterado)
+
     def random_action(self):
         # Gera uma ação aleatória válida para o cromossomo
-        return random.choice(['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO'])
+        return self.rng.choice(['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO'])
+
+
+class ArrayGeneticAlgorithm(GeneticAlgorithm):
+    # Variante do GA em que a população é uma matriz uint8 (pop_size, chrom_length) de
+    # códigos de ação (índices em ACOES) e o fitness é um vetor. Seleção, cruzamento de
+    # ponto único, mutação e elitismo são operações de índice/máscara, e a avaliação usa
+    # batch_evaluate. Os operadores seguem as mesmas regras do GeneticAlgorithm.
+
+    def __init__(self, *args, rng=None, **kwargs):
+        # Aceita os mesmos parâmetros do GeneticAlgorithm
+        super().__init__(*args, **kwargs)
+        # Checkpoints de prefixo não se aplicam: batch_evaluate já avança todas as linhas juntas
+        self.checkpoint_every = 0
+        # Gerador NumPy próprio para os operadores genéticos
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def initial_population(self):
+        return self.rng.integers(0, len(ACOES), size=(self.pop_size, self.chrom_length), dtype=np.uint8)
+
+    def evaluate(self, population, world):
+        cache = self.fitness_cache
+        if cache is None:
+            return self._batch(population, world)
+
+        # Consulta o cache linha a linha (chave = bytes do cromossomo) e simula só as faltas
+        world_key = self.world_key(world)
+        keys = [(world_key, linha.tobytes()) for linha in population]
+        fitness = np.empty(len(population), dtype=np.float64)
+        faltas = []
+        for i, key in enumerate(keys):
+            valor = cache.get(key)
+            if valor is None:
+                faltas.append(i)
+            else:
+                fitness[i] = valor
+        if faltas:
+            novos = self._batch(population[faltas], world)
+            fitness[faltas] = novos
+            for i, valor in zip(faltas, novos.tolist()):
+                cache.put(keys[i], valor)
+        return fitness
+
+    def sort(self, population, fitness):
+        # Ordenação estável, como list.sort(reverse=True) na versão com objetos
+        order = np.argsort(-fitness, kind='stable')
+        return population[order], fitness[order].tolist()
+
+    def diversity(self, population):
+        # A população já é a matriz de códigos
+        return locus_diversity(population)
+
+    def _instrument(self):
+        # Operadores vetorizados: os tempos são medidos por bloco em next_generation
+        pass
+
+    def next_generation(self, population):
+        rng = self.rng
+        t = self.timer
+        if t:
+            t.mark()
+        n_filhos = self.pop_size - 2
+        n_pares = (n_filhos + 1) // 2
+
+        # Seleção: pais sorteados entre os 10 melhores (população já ordenada)
+        top = min(10, len(population))
+        p1 = population[rng.integers(0, top, n_pares)]
+        p2 = population[rng.integers(0, top, n_pares)]
+        if t:
+            t.lap('selecao')
+
+        # Cruzamento de ponto único: c1 herda de p1 antes do corte e de p2 depois dele;
+        # sem cruzamento, os filhos são cópias dos pais
+        cruza = rng.random(n_pares) < self.crossover_rate
+        pontos = rng.integers(1, self.chrom_length, n_pares)
+        de_p1 = (np.arange(self.chrom_length) < pontos[:, None]) | ~cruza[:, None]
+        c1 = np.where(de_p1, p1, p2)
+        c2 = np.where(de_p1, p2, p1)
+        filhos = np.stack([c1, c2], axis=1).reshape(-1, self.chrom_length)[:n_filhos]
+        if t:
+            t.lap('cruzamento')
+
+        # Mutação: cada gene é trocado por uma ação aleatória com probabilidade mutation_rate
+        mascara = rng.random(filhos.shape) < self.mutation_rate
+        filhos[mascara] = rng.integers(0, len(ACOES), int(mascara.sum()), dtype=np.uint8)
+        if t:
+            t.lap('mutacao')
+
+        # Elitismo: os dois melhores seguem sem alteração
+        return np.concatenate([population[:2], filhos])
+
+    def emigrants(self, population, fitness_vals, k):
+        return [(population[i].tobytes(), fitness_vals[i]) for i in range(min(k, len(population)))]
+
+    def receive(self, population, fitness_vals, imigrantes):
+        if not imigrantes:
+            return population, fitness_vals
+        n = len(imigrantes)
+        population = population.copy()
+        population[-n:] = np.frombuffer(b''.join(genome for genome, _ in imigrantes),
+                                        dtype=np.uint8).reshape(n, self.chrom_length)
+        fitness = np.array(fitness_vals[:-n] + [fitness for _, fitness in imigrantes], dtype=np.float64)
+        return self.sort(population, fitness)
+
+    def population_arrays(self, population):
+        return population, np.empty(0, dtype=np.float64)
+
+    def population_from_arrays(self, matriz, fitness):
+        return matriz.astype(np.uint8, copy=True)
+
+    def replace_head(self, population, semeados):
+        return np.concatenate((semeados, population[len(semeados):]))
+
+    def store_population(self, population, world):
+        self.population_store.save(world, self.store_params(), population, self._fitness_final)
+
+    def rng_state(self):
+        return self.rng.bit_generator.state
+
+    def set_rng_state(self, state):
+        self.rng.bit_generator.state = state
+
+    def _batch(self, matriz, world):
+        # Avalia um bloco de linhas localmente ou no pool de workers
+        self.evaluations += len(matriz)
+        if self.pool is None:
+            return kernel_evaluate(matriz, world) if self.kernel else batch_evaluate(matriz, world)
+        return np.array(self.pool.evaluate([linha.tobytes() for linha in matriz]), dtype=np.float64)
+
+    def finalize(self, population, world):
+        fitness = self.evaluate(population, world)
+        self._fitness_final = fitness
+        best = int(np.argmax(fitness))
+        chromosomes = [[ACOES[codigo] for codigo in linha] for linha in population.tolist()]
+        best_individual = Individual.from_chromosome(chromosomes[best], float(fitness[best]))
+        return best_individual, chromosomes
@@ -0,0 +1,123 @@
+# ==============================
+# ga/history.py
+# ==============================
+'''
+# Este arquivo implementa a classe HistoryBuffer, usada pelo GeneticAlgorithm para
+# guardar os históricos por geração (fitness da população, estatísticas, memória/CPU,
+# diversidade) em arrays NumPy pré-alocados, em vez de listas de listas. Opcionalmente,
+# limita o número de linhas mantidas em RAM (dizimação: ao encher, descarta uma linha
+# sim e outra não e passa a guardar a cada 2k amostras) e grava o histórico completo
+# em um arquivo .npy mapeado em memória, para execuções com milhares de gerações.
+'''
+
+import os
+
+import numpy as np
+
+
+class HistoryBuffer:
+    def __init__(self, capacidade, largura=None, dtype=np.float32, max_rows=None, spill_path=None):
+        """
+        :param capacidade: Número máximo de linhas que serão adicionadas (ex.: número de gerações)
+        :param largura: Tamanho de cada linha (None = um valor escalar por linha)
+        :param dtype: Tipo dos valores armazenados
+        :param max_rows: Máximo de linhas mantidas em RAM (None = todas)
+        :param spill_path: Arquivo .npy que recebe todas as linhas, sem dizimação (opcional)
+        """
+        self.capacidade = capacidade
+        self.largura = largura
+        forma = (capacidade,) if largura is None else (capacidade, largura)
+        linhas_ram = capacidade if not max_rows else max(2, min(capacidade, max_rows))
+        self._dados = np.empty((linhas_ram,) + forma[1:], dtype=dtype)
+        self._geracoes = np.empty(linhas_ram, dtype=np.int64)
+        # total: linhas adicionadas; n: linhas em RAM; stride: intervalo entre amostras mantidas
+        self.total = 0
+        self.n = 0
+        self.stride = 1
+        self._ultima = np.zeros(forma[1:], dtype=dtype)
+        self.spill_path = spill_path
+        self._spill = None
+        if spill_path:
+            pasta = os.path.dirname(spill_path)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            self._spill = np.lib.format.open_memmap(spill_path, mode='w+', dtype=dtype, shape=forma)
+
+    def append(self, linha, geracao=None):
+        """
+        Adiciona uma linha ao histórico.
+        :param geracao: Índice da geração da linha (padrão: número de linhas já adicionadas)
+        """
+        if self._spill is not None:
+            self._spill[self.total] = linha
+        if self.total % self.stride == 0:
+            if self.n == len(self._dados):
+                # RAM cheia: mantém uma amostra sim e outra não e dobra o intervalo
+                metade = (self.n + 1) // 2
+                self._dados[:metade] = self._dados[:self.n:2]
+                self._geracoes[:metade] = self._geracoes[:self.n:2]
+                self.n = metade
+                self.stride *= 2
+            if self.total % self.stride == 0:
+                self._dados[self.n] = linha
+                self._geracoes[self.n] = self.total if geracao is None else geracao
+                self.n += 1
+        self._ultima[...] = linha
+        self.total += 1
+
+    def last(self):
+        # Última linha adicionada (mesmo que não tenha sido mantida em RAM)
+        return self._ultima.copy()
+
+    def array(self):
+        # Linhas mantidas em RAM (cópia)
+        return self._dados[:self.n].copy()
+
+    def geracoes(self):
+        # Índice da geração de cada linha mantida em RAM
+        return self._geracoes[:self.n].tolist()
+
+    def state(self):
+        """
+        Estado serializável do buffer (para checkpoints).
+        :return: (linhas em RAM, gerações, metadados)
+        """
+        return self.array(), self._geracoes[:self.n].copy(), {'total': self.total, 'stride': self.stride}
+
+    def restore(self, dados, geracoes, meta, ultima=None):
+        """
+        Restaura o estado salvo por state(). Com spill_path, as linhas restauradas são
+        regravadas no arquivo apenas se o buffer mantinha todas as linhas (stride 1).
+        """
+        self.n = len(dados)
+        self._dados[:self.n] = dados
+        self._geracoes[:self.n] = geracoes
+        self.total = meta['total']
+        self.stride = meta['stride']
+        if ultima is not None:
+            self._ultima[...] = ultima
+        elif self.n:
+            self._ultima[...] = dados[-1]
+        if self._spill is not None and self.stride == 1:
+            self._spill[:self.n] = dados
+
+    def close(self):
+        """
+        Fecha o arquivo mapeado. Se menos linhas que a capacidade foram adicionadas
+        (parada antecipada), o arquivo é reescrito só com as linhas preenchidas.
+        """
+        if self._spill is None:
+            return
+        self._spill.flush()
+        if self.total < self.capacidade:
+            preenchido = np.array(self._spill[:self.total])
+            del self._spill
+            temporario = self.spill_path + ".tmp.npy"
+            np.save(temporario, preenchido)
+            os.replace(temporario, self.spill_path)
+        else:
+            del self._spill
+        self._spill = None
+
+    def __len__(self):
+        return self.total
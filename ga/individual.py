@@ -9,42 +9,94 @@
 '''
 
 import random
+from world.world import ACAO_CODIGO, AGARRAR, TIRO, FEDOR, BRILHO, STATUS_MORTO
 
-def random_action():
-    # Retorna uma ação aleatória válida para o agente
-    return random.choice(['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO'])
+def random_action(rng=None):
+    # Retorna uma ação aleatória válida para o agente (rng: random.Random; padrão: módulo random)
+    return (rng or random).choice(['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO'])
 
 class Individual:
-    def __init__(self, chrom_length):
-        # Inicializa o cromossomo com uma sequência aleatória de ações
-        self.chromosome = [random_action() for _ in range(chrom_length)]
+    def __init__(self, chrom_length, rng=None):
+        # Inicializa o cromossomo com uma sequência aleatória de ações do gerador informado
+        self.chromosome = [random_action(rng) for _ in range(chrom_length)]
         # Valor de fitness (avaliação de desempenho do indivíduo)
         self.fitness = None
+        # Checkpoints da simulação: checkpoints[j] = (snapshot do mundo, pontuação) antes do gene j * checkpoint_every
+        self.checkpoints = []
+        self.checkpoint_every = 0
+        self.checkpoint_world = None  # Mundo em que os checkpoints foram gravados
 
-    def evaluate(self, world):
+    @classmethod
+    def from_chromosome(cls, chromosome, fitness=None):
+        """
+        Cria um indivíduo com um cromossomo já definido (sem sortear ações).
+        :param chromosome: Lista de ações (strings)
+        :param fitness: Fitness já conhecido (opcional)
+        :return: Novo Individual
+        """
+        individual = cls.__new__(cls)
+        individual.chromosome = list(chromosome)
+        individual.fitness = fitness
+        individual.checkpoints = []
+        individual.checkpoint_every = 0
+        individual.checkpoint_world = None
+        return individual
+
+    def __deepcopy__(self, memo):
+        # Cópia barata: os checkpoints são tuplas imutáveis e o mundo é compartilhado
+        individual = Individual.from_chromosome(self.chromosome, self.fitness)
+        individual.checkpoints = self.checkpoints[:]
+        individual.checkpoint_every = self.checkpoint_every
+        individual.checkpoint_world = self.checkpoint_world
+        return individual
+
+    def inherit_checkpoints(self, parent, prefix_length):
+        """
+        Copia os checkpoints do pai que dependem só dos primeiros prefix_length genes (prefixo comum).
+        """
+        self.checkpoint_every = parent.checkpoint_every
+        self.checkpoint_world = parent.checkpoint_world
+        self.checkpoints = parent.checkpoints[:prefix_length // parent.checkpoint_every + 1] if parent.checkpoint_every else []
+
+    def invalidate_checkpoints(self, index):
+        """
+        Descarta os checkpoints que dependem do gene index (chamado quando o gene é alterado).
+        """
+        if self.checkpoint_every:
+            del self.checkpoints[index // self.checkpoint_every + 1:]
+
+    def evaluate(self, world, checkpoint_every=0):
         """
         Executa a sequência de ações no mundo e avalia o desempenho.
         :param world: Instância do mundo do Wumpus para simulação
+        :param checkpoint_every: Grava um checkpoint a cada k genes e retoma do mais profundo válido (0 desativa)
         :return: Nenhum retorno, mas atualiza o atributo fitness do indivíduo
         """
         temp_world = world.clone()  # Cria uma cópia do mundo para simulação
         score = 0  # Inicializa a pontuação
-        for i, action in enumerate(self.chromosome):
-            # Executa cada ação do cromossomo no mundo simulado
-            percept, status = temp_world.step(action)
+        chromosome = self.chromosome
+        start = 0
+        checkpoints = None
+        if checkpoint_every > 0:
+            checkpoints = []
+            # Retoma do checkpoint mais profundo ainda válido (gravado no mesmo mundo)
+            if self.checkpoints and self.checkpoint_world is world and self.checkpoint_every == checkpoint_every:
+                j = len(self.checkpoints) - 1
+                state, score = self.checkpoints[j]
+                temp_world.restore(state)
+                start = j * checkpoint_every
+                checkpoints = self.checkpoints[:j]
+            self.checkpoints = checkpoints
+            self.checkpoint_every = checkpoint_every
+            self.checkpoint_world = world
+        passo = checkpoint_every if checkpoint_every > 0 else max(len(chromosome), 1)
 
-            if status == 'MORTO':
-                # Penalidade alta se o agente morrer
-                score -= 100
+        for inicio in range(start, len(chromosome), passo):
+            if checkpoints is not None:
+                checkpoints.append((temp_world.snapshot(), score))
+            score, morreu = self._simulate(temp_world, chromosome[inicio:inicio + passo], score)
+            if morreu:
                 break
-            if action == 'AGARRAR' and 'BRILHO' in percept:
-                score += 100  # Bônus se encontrar o ouro
-            if action == 'TIRO' and 'FEDOR' in percept:
-                score += 25   # Atirar com cheiro = tentativa válida
-            if action in ['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA']:
-                score -= 0.5  # Penalidade leve por andar
-            else:
-                score -= 1  # Penalidade padrão
 
         # Pequeno bônus por sobrevivência
         if temp_world.is_alive:
@@ -52,4 +104,24 @@ class Individual:
         # Salva o fitness final do indivíduo
         self.fitness = score
 
+    @staticmethod
+    def _simulate(temp_world, actions, score):
+        # Executa um trecho do cromossomo; retorna (pontuação acumulada, se o agente morreu)
+        for action in actions:
+            # Executa cada ação do cromossomo no mundo simulado (caminho rápido com inteiros)
+            code = ACAO_CODIGO.get(action, -1)
+            percept, status = temp_world.step_fast(code)
 
+            if status == STATUS_MORTO:
+                # Penalidade alta se o agente morrer
+                score -= 100
+                return score, True
+            if code == AGARRAR and percept & BRILHO:
+                score += 100  # Bônus se encontrar o ouro
+            if code == TIRO and percept & FEDOR:
+                score += 25   # Atirar com cheiro = tentativa válida
+            if 0 <= code < AGARRAR:
+                score -= 0.5  # Penalidade leve por andar
+            else:
+                score -= 1  # Penalidade padrão
+        return score, False
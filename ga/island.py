@@ -0,0 +1,252 @@
+# ==============================
+# ga/island.py
+# ==============================
+'''
+# Este arquivo implementa o modelo de ilhas do algoritmo genético. Cada ilha é uma
+# subpopulação que evolui em um processo próprio (com GeneticAlgorithm ou
+# ArrayGeneticAlgorithm) e, a cada migration_interval gerações, envia seus
+# migration_size melhores indivíduos para a próxima ilha do anel e recebe os da anterior.
+# Os critérios de parada antecipada são decididos em conjunto nos pontos de migração
+# (IslandStop): todas as ilhas param na mesma geração, com o mesmo motivo.
+# Ao final, os históricos das ilhas são combinados no mesmo formato de resultado do
+# GeneticAlgorithm, para que gerar_graficos_avancados continue funcionando.
+'''
+
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+import psutil
+
+from world.world import World
+from .ga_core import GeneticAlgorithm, ArrayGeneticAlgorithm
+from .seeding import python_rng, numpy_rng
+
+
+class IslandStop:
+    # Votos de parada de cada ilha (bits) e avaliações feitas, trocados em uma barreira
+    ALVO, ESTAGNACAO, TEMPO = 1, 2, 4
+
+    def __init__(self, ctx, n_islands):
+        self.barreira = ctx.Barrier(n_islands)
+        self.votos = ctx.Array('i', n_islands, lock=False)
+        self.avaliacoes = ctx.Array('q', n_islands, lock=False)
+
+    def decide(self, indice, ga, stats, geracoes_sem_melhora, tempo_decorrido):
+        """
+        Registra o voto da ilha e retorna o motivo de parada combinado (igual em todas as
+        ilhas): fitness alvo ou tempo esgotado em qualquer ilha, estagnação em todas ou
+        max_evaluations somando as avaliações de todas. None = continuar.
+        """
+        voto = 0
+        if ga.target_fitness is not None and stats['max'] >= ga.target_fitness:
+            voto |= self.ALVO
+        if ga.stagnation_window is not None and geracoes_sem_melhora >= ga.stagnation_window:
+            voto |= self.ESTAGNACAO
+        if ga.time_budget is not None and tempo_decorrido >= ga.time_budget:
+            voto |= self.TEMPO
+        self.votos[indice] = voto
+        self.avaliacoes[indice] = ga.evaluations
+        self.barreira.wait()
+        votos, total = list(self.votos), sum(self.avaliacoes)
+        # Segunda barreira: nenhuma ilha grava o próximo voto antes de todas lerem este
+        self.barreira.wait()
+        if any(v & self.ALVO for v in votos):
+            return 'target_fitness'
+        if all(v & self.ESTAGNACAO for v in votos):
+            return 'stagnation'
+        if ga.max_evaluations is not None and total >= ga.max_evaluations:
+            return 'max_evaluations'
+        if any(v & self.TEMPO for v in votos):
+            return 'time_budget'
+        return None
+
+
+def _island_worker(indice, engine_cls, ga_kwargs, layout, state, seed_seq,
+                   inbox, outbox, resultados, migration_interval, migration_size, parada=None):
+    # Gerador próprio de cada ilha: random.Random (GA com objetos) ou numpy Generator
+    kwargs = dict(ga_kwargs)
+    if kwargs.get('history_dir'):
+        # Cada ilha grava seus históricos em uma subpasta própria
+        kwargs['history_dir'] = os.path.join(kwargs['history_dir'], f"ilha_{indice}")
+    if kwargs.get('memory_report_path'):
+        # Um relatório de memória por ilha (ex.: tracemalloc_ilha_0.txt)
+        raiz, extensao = os.path.splitext(kwargs['memory_report_path'])
+        kwargs['memory_report_path'] = f"{raiz}_ilha_{indice}{extensao}"
+    kwargs['rng'] = numpy_rng(seed_seq) if issubclass(engine_cls, ArrayGeneticAlgorithm) else python_rng(seed_seq)
+    ga = engine_cls(**kwargs)
+    world = World.from_layout(layout, state)
+
+    process = psutil.Process(os.getpid())
+    process.cpu_percent()
+    profiler = ga.start_memory_profile()
+    population = ga.initial_population()
+    stop_reason, stop_generation = 'max_gens', ga.gens
+    inicio = time.perf_counter()
+    melhor_max, melhor_media, ultima_melhora = None, None, 0
+    for g in range(ga.gens):
+        population, fitness_vals = ga.evaluate_generation(population, world, process)
+        stats = ga.last_stats()
+        if melhor_max is None or stats['max'] > melhor_max + ga.stagnation_tol \
+                or stats['mean'] > melhor_media + ga.stagnation_tol:
+            ultima_melhora = g
+        melhor_max = stats['max'] if melhor_max is None else max(melhor_max, stats['max'])
+        melhor_media = stats['mean'] if melhor_media is None else max(melhor_media, stats['mean'])
+        # Migração em anel: envia os melhores para a próxima ilha e recebe da anterior
+        if (g + 1) % migration_interval == 0 and g + 1 < ga.gens:
+            outbox.put(ga.emigrants(population, fitness_vals, migration_size))
+            population, fitness_vals = ga.receive(population, fitness_vals, inbox.get())
+            # Parada antecipada combinada entre as ilhas (avaliada só nos pontos de migração)
+            if parada is not None:
+                motivo = parada.decide(indice, ga, stats, g - ultima_melhora, time.perf_counter() - inicio)
+                if motivo is not None:
+                    stop_reason, stop_generation = motivo, g + 1
+                    break
+        population = ga.next_generation(population)
+        if profiler and (g + 1) % ga.memory_profile_every == 0:
+            profiler.sample(f"geração {g + 1}")
+
+    best, final_pop = ga.finalize(population, world)
+    if profiler:
+        ga.memory_profile = profiler.finish()
+    resultados.put((indice, ga.build_result(best, final_pop, stop_reason, stop_generation)))
+
+
+class IslandGeneticAlgorithm:
+    def __init__(self, n_islands, migration_interval=10, migration_size=2, vectorized=False, seed=None, **ga_kwargs):
+        """
+        :param n_islands: Número de ilhas (um processo por ilha)
+        :param migration_interval: Gerações entre migrações
+        :param migration_size: Quantidade de melhores indivíduos enviados em cada migração
+        :param vectorized: Usa ArrayGeneticAlgorithm em cada ilha
+        :param seed: Semente ou SeedSequence para os geradores das ilhas (opcional)
+        :param ga_kwargs: Parâmetros do GeneticAlgorithm de cada ilha (pop_size é por ilha).
+                          stagnation_window, target_fitness, max_evaluations (total das ilhas) e
+                          time_budget são verificados a cada migration_interval gerações
+        """
+        # Checkpoints em disco e warm start não são suportados no modelo de ilhas
+        for nome in ('save_path', 'warm_start_dir'):
+            if ga_kwargs.get(nome):
+                raise ValueError(f"{nome} não é suportado com o modelo de ilhas (n_islands > 1)")
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.engine_cls = ArrayGeneticAlgorithm if vectorized else GeneticAlgorithm
+        self.seed = seed
+        # As ilhas já rodam em paralelo: cada uma avalia serialmente
+        self.ga_kwargs = dict(ga_kwargs, n_workers=1)
+        self.gens = ga_kwargs['gens']
+
+    def run(self, world, logger=None):
+        ctx = multiprocessing.get_context()
+        inboxes = [ctx.Queue() for _ in range(self.n_islands)]
+        resultados = ctx.Queue()
+        # seed pode ser um inteiro ou a SeedSequence da execução (ver ga/seeding.py)
+        raiz = self.seed if isinstance(self.seed, np.random.SeedSequence) else np.random.SeedSequence(self.seed)
+        sementes = raiz.spawn(self.n_islands)
+        criterios = ('stagnation_window', 'target_fitness', 'max_evaluations', 'time_budget')
+        parada = IslandStop(ctx, self.n_islands) if any(self.ga_kwargs.get(c) is not None for c in criterios) else None
+        processos = [
+            ctx.Process(
+                target=_island_worker,
+                args=(i, self.engine_cls, self.ga_kwargs, world.layout, world.snapshot(), sementes[i],
+                      inboxes[i], inboxes[(i + 1) % self.n_islands], resultados,
+                      self.migration_interval, self.migration_size, parada),
+                daemon=True,
+            )
+            for i in range(self.n_islands)
+        ]
+        for p in processos:
+            p.start()
+
+        # Coleta os resultados; se uma ilha morrer sem responder, aborta em vez de travar
+        por_ilha = {}
+        try:
+            while len(por_ilha) < self.n_islands:
+                try:
+                    indice, resultado = resultados.get(timeout=1.0)
+                    por_ilha[indice] = resultado
+                except queue.Empty:
+                    if any(p.exitcode not in (None, 0) for p in processos):
+                        raise RuntimeError("Uma das ilhas do GA terminou com erro")
+        finally:
+            for p in processos:
+                if por_ilha.keys() == set(range(self.n_islands)):
+                    p.join()
+                else:
+                    p.terminate()
+
+        resultado = self.merge([por_ilha[i] for i in range(self.n_islands)])
+        if logger:
+            for i, r in enumerate(resultado['ilhas']):
+                logger.write(f"[GA] Ilha {i+1}: melhor fitness = {r['best_fitness']}")
+            if resultado['stop_reason'] != 'max_gens':
+                logger.write(f"[GA] Parada antecipada das ilhas na geração {resultado['stop_generation']}: "
+                             f"{resultado['stop_reason']}")
+            logger.write(f"[GA] Fim das gerações (ilhas). Melhor fitness: {resultado['best'].fitness}")
+        return resultado
+
+    def merge(self, resultados):
+        """
+        Combina os resultados das ilhas no formato do GeneticAlgorithm:
+        fitness_pop concatena as populações por geração, memória/CPU são somadas
+        (uso total dos processos) e a diversidade por variável é a média das ilhas.
+        As estatísticas por geração combinam as das ilhas (todas têm o mesmo tamanho).
+        """
+        fitness_pop = np.concatenate([r['fitness_pop'] for r in resultados], axis=1)
+        fitness_history = [
+            {
+                'min': min(h['min'] for h in stats),
+                'mean': sum(h['mean'] for h in stats) / len(stats),
+                'max': max(h['max'] for h in stats),
+            }
+            for stats in zip(*(r['fitness_history'] for r in resultados))
+        ]
+        diversidade_ilhas = np.array([r['diversidade_vars'] for r in resultados])
+        best = max((r['best'] for r in resultados), key=lambda ind: ind.fitness)
+        return {
+            "best": best,
+            "fitness_history": fitness_history,
+            "fitness_pop": fitness_pop,
+            "fitness_pop_geracoes": resultados[0]['fitness_pop_geracoes'],
+            "fitness_final": [f for r in resultados for f in r['fitness_final']],
+            "historico_dir": self.ga_kwargs.get('history_dir'),
+            "tempos": self.merge_timings([r['tempos'] for r in resultados]),
+            "memoria_tracemalloc": [r['memoria_tracemalloc'] for r in resultados]
+            if resultados[0]['memoria_tracemalloc'] else None,
+            "final_pop": [chrom for r in resultados for chrom in r['final_pop']],
+            "memoria": np.sum([r['memoria'] for r in resultados], axis=0).tolist(),
+            "cpu": np.sum([r['cpu'] for r in resultados], axis=0).tolist(),
+            "diversidade_vars": diversidade_ilhas.mean(axis=0),
+            "entropia_vars": np.mean([r['entropia_vars'] for r in resultados], axis=0),
+            "diversidade_geracoes": resultados[0]['diversidade_geracoes'],
+            "diversidade_ilhas": diversidade_ilhas,
+            "cache": None,
+            # A parada é combinada entre as ilhas: todas têm o mesmo motivo e geração
+            "stop_reason": resultados[0]['stop_reason'],
+            "stop_generation": resultados[0]['stop_generation'],
+            "evaluations": sum(r['evaluations'] for r in resultados),
+            "ilhas": [
+                {
+                    "best_fitness": r['best'].fitness,
+                    "evaluations": r['evaluations'],
+                    "cache": r['cache'],
+                    "fitness_history": r['fitness_history'],
+                }
+                for r in resultados
+            ],
+        }
+
+    def merge_timings(self, tempos):
+        # Soma os tempos e avaliações das ilhas (tempo total dos processos) por geração
+        if any(t is None for t in tempos):
+            return None
+        somados = {chave: np.sum([t[chave] for t in tempos], axis=0).tolist() for chave in tempos[0]}
+        avaliacoes = np.array(somados['avaliacoes'], dtype=np.float64)
+        tempo_avaliacao = np.array(somados['avaliacao'])
+        somados['avaliacoes_por_segundo'] = np.divide(
+            avaliacoes, tempo_avaliacao, out=np.zeros(len(avaliacoes)), where=tempo_avaliacao > 0
+        ).tolist()
+        return somados
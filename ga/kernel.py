@@ -0,0 +1,159 @@
+# ==============================
+# ga/kernel.py
+# ==============================
+'''
+# Este arquivo implementa um kernel de simulação compilado (opcional) para avaliar
+# cromossomos codificados em inteiros sobre um layout codificado em tabelas planas.
+# Se o Numba estiver instalado, o laço é compilado com numba.njit; caso contrário, o
+# mesmo código roda em Python puro sobre listas. O fitness é idêntico ao de
+# Individual.evaluate (mesmas penalidades de morte, movimento e ações e mesmos bônus
+# de ouro, tiro e sobrevivência). check_parity() compara o kernel com uma simulação de
+# referência que usa World.step e pode ser executada com: python -m ga.kernel
+'''
+
+import functools
+import random
+
+import numpy as np
+
+from world.world import ACOES, ACAO_CODIGO, AGARRAR, TIRO, World
+from .batch_eval import _tabelas, _RECOMPENSA, _NUM_CODIGOS
+
+try:
+    import numba
+except ImportError:  # Numba é opcional: sem ele o kernel roda em Python puro
+    numba = None
+
+NUMBA_DISPONIVEL = numba is not None
+
+
+def _simular(actions, move, pit, gold, wumpus, adj_wumpus, percept, recompensa,
+             inicio, vivo_inicial, wumpus_inicial, num_celulas, out):
+    # Simula cada linha de actions e grava o fitness em out. As tabelas são planas:
+    # move[célula * _NUM_CODIGOS + código], percept[wumpus_vivo * num_celulas + célula], recompensa[código * 8 + máscara]
+    for i in range(len(actions)):
+        genes = actions[i]
+        pos = inicio
+        wumpus_vivo = wumpus_inicial
+        vivo = vivo_inicial
+        score = 0.0
+        for g in range(len(genes)):
+            a = genes[g]
+            pos = move[pos * _NUM_CODIGOS + a]
+            if a == TIRO and adj_wumpus[pos]:
+                wumpus_vivo = 0
+            # Pegar o ouro encerra a interação sem checar mortes
+            if not (a == AGARRAR and gold[pos]) and (pit[pos] or (wumpus[pos] and wumpus_vivo)):
+                score -= 100
+                vivo = 0
+                break
+            score += recompensa[a * 8 + percept[wumpus_vivo * num_celulas + pos]]
+        if vivo:
+            score += 10
+        out[i] = score
+
+
+_simular_compilado = numba.njit(cache=True)(_simular) if NUMBA_DISPONIVEL else None
+
+
+@functools.lru_cache(maxsize=32)
+def _tabelas_planas(layout):
+    # Tabelas de _tabelas() achatadas, nos tipos usados pelo kernel compilado
+    move, pit, gold, wumpus, adj_wumpus, percept = _tabelas(layout)
+    return (
+        np.ascontiguousarray(move, dtype=np.int64).ravel(),
+        pit.astype(np.uint8), gold.astype(np.uint8), wumpus.astype(np.uint8), adj_wumpus.astype(np.uint8),
+        np.ascontiguousarray(percept, dtype=np.int64).ravel(),
+        np.ascontiguousarray(_RECOMPENSA).ravel(),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _tabelas_listas(layout):
+    # As mesmas tabelas como listas (indexação mais rápida em Python puro)
+    return tuple(tabela.tolist() for tabela in _tabelas_planas(layout))
+
+
+def kernel_evaluate(actions, world, compilado=None):
+    """
+    Avalia cromossomos codificados com o kernel de simulação.
+    :param actions: Matriz (pop_size, chrom_length) de códigos de ação (uint8)
+    :param world: World (parte do seu estado atual) ou WorldLayout (parte do estado inicial)
+    :param compilado: Força (True) ou desativa (False) o Numba; None usa se disponível
+    :return: np.ndarray float64 (pop_size,) com o fitness de cada indivíduo
+    """
+    actions = np.asarray(actions, dtype=np.uint8)
+    if isinstance(world, World):
+        layout = world.layout
+        (ax, ay), vivo, wumpus_vivo, _, _ = world.snapshot()
+    else:
+        layout = world
+        (ax, ay), vivo, wumpus_vivo = (0, 0), True, True
+    if compilado is None:
+        compilado = NUMBA_DISPONIVEL
+    if compilado and not NUMBA_DISPONIVEL:
+        raise ImportError("O kernel compilado requer o pacote numba")
+
+    args = (ax * layout.size + ay, int(vivo), int(wumpus_vivo), layout.size * layout.size)
+    if compilado:
+        out = np.empty(len(actions), dtype=np.float64)
+        _simular_compilado(np.ascontiguousarray(actions), *_tabelas_planas(layout), *args, out)
+        return out
+    out = [0.0] * len(actions)
+    _simular(actions.tolist(), *_tabelas_listas(layout), *args, out)
+    return np.array(out, dtype=np.float64)
+
+
+def reference_score(chromosome, world):
+    """
+    Fitness de referência calculado com a API de strings de World.step
+    (mesma regra de pontuação de Individual.evaluate).
+    """
+    temp_world = world.clone()
+    score = 0
+    for action in chromosome:
+        percept, status = temp_world.step(action)
+        if status == 'MORTO':
+            score -= 100
+            break
+        if action == 'AGARRAR' and 'BRILHO' in percept:
+            score += 100
+        if action == 'TIRO' and 'FEDOR' in percept:
+            score += 25
+        if action in ['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA']:
+            score -= 0.5
+        else:
+            score -= 1
+    if temp_world.is_alive:
+        score += 10
+    return score
+
+
+def check_parity(sizes=(4, 6, 8), seeds=range(10), pop_size=64, chrom_length=80, seed=0):
+    """
+    Compara o kernel (compilado, se disponível, e Python puro) com reference_score em
+    mundos e cromossomos aleatórios, incluindo genes desconhecidos.
+    :return: Número de comparações feitas
+    :raises AssertionError: Se algum fitness divergir
+    """
+    rng = random.Random(seed)
+    modos = [False, True] if NUMBA_DISPONIVEL else [False]
+    comparacoes = 0
+    for size in sizes:
+        for world_seed in seeds:
+            world = World(size, seed=world_seed)
+            genes = ACOES + ['INVALIDA']
+            chromosomes = [[rng.choice(genes) for _ in range(chrom_length)] for _ in range(pop_size)]
+            esperado = [reference_score(c, world) for c in chromosomes]
+            codigos = np.array([[ACAO_CODIGO.get(g, 255) for g in c] for c in chromosomes], dtype=np.uint8)
+            for compilado in modos:
+                obtido = kernel_evaluate(codigos, world, compilado).tolist()
+                for i, (e, o) in enumerate(zip(esperado, obtido)):
+                    assert e == o, f"Divergência (tamanho={size}, semente={world_seed}, indivíduo={i}, numba={compilado}): {e} != {o}"
+                comparacoes += len(esperado)
+    return comparacoes
+
+
+if __name__ == "__main__":
+    total = check_parity()
+    print(f"Kernel idêntico à referência em {total} avaliações (numba disponível: {NUMBA_DISPONIVEL})")
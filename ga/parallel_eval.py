@@ -0,0 +1,99 @@
+# ==============================
+# ga/parallel_eval.py
+# ==============================
+'''
+# Este arquivo implementa a avaliação paralela de fitness usada pelo GeneticAlgorithm.
+# O PoolEvaluator mantém um pool persistente de threads ou processos durante toda a
+# execução do GA: o layout do mundo é enviado uma única vez pelo inicializador de cada
+# worker e, a cada geração, só trafegam cromossomos (bytes com os códigos das ações)
+# e valores de fitness (floats). Cada worker avalia seu lote com batch_evaluate ou,
+# se o GA usa kernel=True, com kernel_evaluate (ver ga/kernel.py).
+'''
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from world.world import World, ACOES, ACAO_CODIGO
+from .batch_eval import batch_evaluate
+from .kernel import kernel_evaluate
+
+# Tipos de executor aceitos pelo GeneticAlgorithm
+EXECUTORES = ('serial', 'thread', 'process')
+
+# Mundos dos workers por avaliador: chave do PoolEvaluator → (mundo, usa o kernel).
+# Com threads, vários pools no mesmo processo (ex.: dois GAs rodando ao mesmo tempo)
+# compartilham este dicionário, cada um com sua chave
+_worker_worlds = {}
+_chaves = itertools.count()
+
+
+def _init_worker(chave, layout, state, kernel):
+    _worker_worlds[chave] = (World.from_layout(layout, state), kernel)
+
+
+def _evaluate_chunk(chave, chunk, chrom_length):
+    # Avalia um lote de cromossomos (bytes) no mundo do avaliador
+    world, kernel = _worker_worlds[chave]
+    matriz = np.frombuffer(b''.join(chunk), dtype=np.uint8).reshape(len(chunk), chrom_length)
+    valores = kernel_evaluate(matriz, world) if kernel else batch_evaluate(matriz, world)
+    return valores.tolist()
+
+
+def encode_genome(chromosome):
+    """
+    Converte um cromossomo de strings em bytes (um código de ação por gene).
+    """
+    return bytes(ACAO_CODIGO.get(gene, 255) for gene in chromosome)
+
+
+def decode_genome(genome):
+    """
+    Converte bytes de códigos de ação de volta em um cromossomo de strings.
+    """
+    return [ACOES[codigo] for codigo in genome]
+
+
+class PoolEvaluator:
+    def __init__(self, world, n_workers, kind='process', min_chunk=8, kernel=False):
+        """
+        Cria o pool de workers para avaliar cromossomos no mundo informado.
+        :param world: Mundo de referência (layout + estado inicial do episódio)
+        :param n_workers: Número de workers
+        :param kind: 'thread' ou 'process'
+        :param min_chunk: Tamanho mínimo de lote enviado a cada worker
+        :param kernel: Avalia com kernel_evaluate (ga/kernel.py) em vez de batch_evaluate
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Executor inválido: {kind!r} (use 'thread' ou 'process')")
+        self.n_workers = n_workers
+        self.min_chunk = min_chunk
+        self.chave = next(_chaves)
+        pool_cls = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+        self.pool = pool_cls(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(self.chave, world.layout, world.snapshot(), kernel))
+
+    def evaluate(self, genomes):
+        """
+        Avalia uma lista de cromossomos codificados (bytes de mesmo tamanho).
+        :return: Lista de fitness (floats), na mesma ordem
+        """
+        if not genomes:
+            return []
+        chrom_length = len(genomes[0])
+        # Um lote por worker (com tamanho mínimo), para diluir o custo de comunicação
+        tamanho = max(self.min_chunk, math.ceil(len(genomes) / self.n_workers))
+        futures = [
+            self.pool.submit(_evaluate_chunk, self.chave, genomes[i:i + tamanho], chrom_length)
+            for i in range(0, len(genomes), tamanho)
+        ]
+        resultado = []
+        for future in futures:
+            resultado.extend(future.result())
+        return resultado
+
+    def close(self):
+        self.pool.shutdown()
+        _worker_worlds.pop(self.chave, None)  # Mundo registrado pelos workers de thread
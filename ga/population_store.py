@@ -0,0 +1,70 @@
+# ==============================
+# ga/population_store.py
+# ==============================
+'''
+# Este arquivo implementa a classe PopulationStore, um armazenamento em disco das
+# populações finais do algoritmo genético. Cada população é gravada (em códigos uint8,
+# ordenada do maior para o menor fitness) em um arquivo .npz cujo nome é o hash do
+# layout do mundo (tamanho, ouro, Wumpus, poços), do estado inicial do agente e dos
+# parâmetros do GA. Uma execução seguinte no mesmo mundo e com os mesmos parâmetros
+# pode partir dessa população (warm start) em vez de cromossomos aleatórios.
+'''
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .checkpoint import save_run_state, load_run_state
+
+
+class PopulationStore:
+    def __init__(self, directory):
+        """
+        :param directory: Pasta onde as populações são gravadas (criada na primeira gravação)
+        """
+        self.directory = directory
+
+    @staticmethod
+    def identity(world, params):
+        # Identificação serializável de (mundo, parâmetros): também é gravada no arquivo
+        return json.loads(json.dumps({
+            "mundo": [list(world.layout.fingerprint()), list(world.snapshot())],
+            "params": params,
+        }))
+
+    def path(self, world, params):
+        # Arquivo da população de (mundo, parâmetros)
+        chave = hashlib.sha1(json.dumps(self.identity(world, params), sort_keys=True).encode("utf-8"))
+        return os.path.join(self.directory, chave.hexdigest()[:20] + ".npz")
+
+    def save(self, world, params, matriz, fitness=None):
+        """
+        Grava a população (substitui a anterior de mesma chave).
+        :param matriz: Matriz uint8 (indivíduos, genes) com os códigos das ações
+        :param fitness: Fitness de cada indivíduo (opcional); a população é gravada em ordem decrescente
+        """
+        matriz = np.asarray(matriz, dtype=np.uint8)
+        if fitness is not None and len(fitness) == len(matriz):
+            fitness = np.asarray(fitness, dtype=np.float64)
+            # Ordenação estável, com os não avaliados (NaN) no fim
+            ordem = np.argsort(np.where(np.isnan(fitness), np.inf, -fitness), kind="stable")
+            matriz, fitness = matriz[ordem], fitness[ordem]
+        else:
+            fitness = np.full(len(matriz), np.nan)
+        save_run_state(self.path(world, params), {"population": matriz, "fitness": fitness},
+                       self.identity(world, params))
+
+    def load(self, world, params):
+        """
+        Lê a população gravada para (mundo, parâmetros).
+        :return: (matriz uint8, fitness) ordenados do melhor para o pior, ou None se não houver
+        """
+        caminho = self.path(world, params)
+        if not os.path.exists(caminho):
+            return None
+        arrays, meta = load_run_state(caminho)
+        if meta != self.identity(world, params):
+            return None
+        return arrays["population"], arrays["fitness"]
@@ -0,0 +1,48 @@
+# ==============================
+# ga/seeding.py
+# ==============================
+'''
+# Este arquivo define os fluxos de números aleatórios por execução. Cada execução de
+# benchmark recebe uma SeedSequence derivada de (semente base, agente, tamanho do mundo,
+# índice da execução), e dela são criados os geradores usados pelo algoritmo genético
+# (random.Random para o GA com objetos, numpy Generator para o ArrayGeneticAlgorithm).
+# Assim, qualquer execução pode ser reproduzida isoladamente, em qualquer worker e em
+# qualquer ordem, sem depender do estado global do módulo random.
+'''
+
+import random
+import zlib
+
+import numpy as np
+
+
+def agent_key(agente_nome):
+    # Código estável do nome do agente (hash() do Python muda a cada processo)
+    return zlib.crc32(agente_nome.encode("utf-8"))
+
+
+def run_seed_sequence(seed, agente_nome, world_size, run_index):
+    """
+    Cria a SeedSequence de uma execução.
+    :param seed: Semente base do experimento (inteiro não negativo)
+    :param agente_nome: Nome do agente (ex.: 'genetico')
+    :param world_size: Tamanho do mundo
+    :param run_index: Índice da execução
+    :return: np.random.SeedSequence
+    """
+    return np.random.SeedSequence(seed, spawn_key=(agent_key(agente_nome), world_size, run_index))
+
+
+def python_rng(seed_seq):
+    """
+    Cria um random.Random a partir de uma SeedSequence (128 bits de estado inicial).
+    """
+    palavras = seed_seq.generate_state(4, dtype=np.uint32)
+    return random.Random(int.from_bytes(palavras.tobytes(), "little"))
+
+
+def numpy_rng(seed_seq):
+    """
+    Cria um numpy Generator a partir de uma SeedSequence.
+    """
+    return np.random.default_rng(seed_seq)
@@ -0,0 +1,85 @@
+# ==============================
+# ga/timing.py
+# ==============================
+'''
+# Este arquivo implementa a classe PhaseTimer, que mede o tempo gasto em cada fase
+# de uma geração do algoritmo genético (avaliação, ordenação, diversidade, seleção,
+# cruzamento, mutação e log) com time.perf_counter_ns, além do número de avaliações
+# de fitness por geração. Os tempos ficam em arrays pré-alocados (um valor em
+# nanossegundos por geração e fase). Quando a instrumentação está desativada o GA
+# não cria o PhaseTimer e nenhuma medição é feita.
+'''
+
+import functools
+import time
+
+import numpy as np
+
+# Fases medidas em cada geração (também são as chaves do resultado)
+FASES = ('avaliacao', 'ordenacao', 'diversidade', 'selecao', 'cruzamento', 'mutacao', 'log')
+
+
+class PhaseTimer:
+    def __init__(self, capacidade):
+        """
+        :param capacidade: Número máximo de gerações medidas
+        """
+        self.tempos = np.zeros((len(FASES), capacidade), dtype=np.int64)
+        self.avaliacoes = np.zeros(capacidade, dtype=np.int64)
+        self._indice = {fase: i for i, fase in enumerate(FASES)}
+        # Geração atual (linha onde os tempos são acumulados) e número de gerações medidas
+        self.geracao = 0
+        self.n = 0
+        self._marca = 0
+
+    def begin(self, geracao):
+        # Inicia a medição de uma geração
+        self.geracao = geracao
+        self.n = max(self.n, geracao + 1)
+        self._marca = time.perf_counter_ns()
+
+    def mark(self):
+        # Reinicia o cronômetro sem atribuir o intervalo a nenhuma fase
+        self._marca = time.perf_counter_ns()
+
+    def lap(self, fase):
+        # Atribui à fase o tempo desde a última marca e reinicia o cronômetro
+        agora = time.perf_counter_ns()
+        self.tempos[self._indice[fase], self.geracao] += agora - self._marca
+        self._marca = agora
+
+    def count(self, avaliacoes):
+        # Registra o número de avaliações de fitness da geração atual
+        self.avaliacoes[self.geracao] += avaliacoes
+
+    def wrap(self, fase, funcao):
+        """
+        Retorna funcao instrumentada: cada chamada soma sua duração à fase.
+        Usado para operadores chamados muitas vezes por geração (seleção, cruzamento, mutação).
+        """
+        linha = self.tempos[self._indice[fase]]
+        relogio = time.perf_counter_ns
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = relogio()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                linha[self.geracao] += relogio() - inicio
+        return medida
+
+    def result(self):
+        """
+        :return: Dicionário com os tempos (segundos) por fase e geração, avaliações
+                 por geração e avaliações por segundo (tempo da fase de avaliação)
+        """
+        segundos = self.tempos[:, :self.n] / 1e9
+        resultado = {fase: segundos[i].tolist() for i, fase in enumerate(FASES)}
+        avaliacoes = self.avaliacoes[:self.n]
+        tempo_avaliacao = segundos[self._indice['avaliacao']]
+        resultado['avaliacoes'] = avaliacoes.tolist()
+        resultado['avaliacoes_por_segundo'] = np.divide(
+            avaliacoes, tempo_avaliacao, out=np.zeros(self.n), where=tempo_avaliacao > 0
+        ).tolist()
+        return resultado
@@ -11,19 +11,25 @@ import shlex
 import importlib.util
 import io
 import contextlib
+import inspect
 
 from world.world import World
 from agents.manual_agent import ManualAgent
 from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
 from agents.genetic_agent import GeneticAgent
 from utils.logger import Logger
 from utils.graficos import gerar_graficos, gerar_graficos_avancados
+from ga.seeding import run_seed_sequence
+from utils.result_cache import ResultCache, CAMINHO_PADRAO
+from utils.watchdog import PASSOS_POR_CELULA
 from benchmark import executar_benchmark
 
 # Dicionário de agentes disponíveis
 AGENTES_DISPONIVEIS = {
     "manual": ManualAgent,
     "logico": LogicAgent,
+    "probabilistico": ProbabilisticAgent,
     "genetico": GeneticAgent
 }
 
@@ -45,7 +51,10 @@ def execucao_unica(agente_nome):
 
     mundo = World(size=size, seed=seed)
     agente_cls = AGENTES_DISPONIVEIS[agente_nome]
-    agente = agente_cls(mundo)
+    # Com semente, o agente genético também usa um gerador derivado dela (execução reproduzível)
+    agente_kwargs = {"seed_seq": run_seed_sequence(seed, agente_nome, size, 0)} \
+        if agente_nome == "genetico" and seed is not None else {}
+    agente = agente_cls(mundo, **agente_kwargs)
     if hasattr(agente, "logger"):
         agente.logger = None  # Desativa logger para execução única
 
@@ -57,7 +66,12 @@ def carregar_benchmark(path):
     spec = importlib.util.spec_from_file_location("benchmark_mod", path)
     benchmark_mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(benchmark_mod)
-    return benchmark_mod.executar_benchmark
+    return benchmark_mod
+
+def aceita_parametro(funcao, nome):
+    """Verifica se a função aceita o argumento nomeado (explicitamente ou via **kwargs)."""
+    parametros = inspect.signature(funcao).parameters
+    return nome in parametros or any(p.kind == p.VAR_KEYWORD for p in parametros.values())
 
 def formatar_tempo(segundos):
     """
@@ -124,10 +138,53 @@ def main():
     parser.add_argument("--agentes", nargs="+", choices=AGENTES_DISPONIVEIS.keys(),
                         default=["logico", "genetico"], help="Agentes a incluir no benchmark")
     parser.add_argument("--benchmark", type=str, default="benchmark.py", help="Arquivo de benchmark a ser usado")
+    parser.add_argument("--ga-workers", type=int, default=1,
+                        help="Workers de avaliação de fitness por execução do agente genético")
+    parser.add_argument("--mem-profile", type=int, default=0,
+                        help="Perfil de memória com tracemalloc: snapshot a cada N gerações do GA (0 desativa)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não usa o cache de resultados (todas as execuções são refeitas)")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Remove do cache os resultados dos agentes e tamanhos selecionados antes de executar")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help=f"Limite de passos por episódio (padrão: {PASSOS_POR_CELULA} × tamanho²; 0 desativa)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Tempo máximo de cada execução em segundos")
     args = parser.parse_args(cli_args)
 
     # Carrega o benchmark escolhido pelo usuário
-    executar_benchmark = carregar_benchmark(args.benchmark)
+    benchmark_mod = carregar_benchmark(args.benchmark)
+    executar_benchmark = benchmark_mod.executar_benchmark
+    # Benchmarks com executar_varredura rodam todas as combinações em um único pool de workers
+    executar_varredura = getattr(benchmark_mod, "executar_varredura", None)
+
+    # Só repassa ga_workers quando pedido e aceito pelo benchmark (nem todo arquivo tem o parâmetro)
+    benchmark_kwargs = {}
+    if args.ga_workers > 1:
+        if aceita_parametro(executar_benchmark, "ga_workers"):
+            benchmark_kwargs["ga_workers"] = args.ga_workers
+        else:
+            print(f"⚠️ O benchmark '{args.benchmark}' não aceita ga_workers: --ga-workers será ignorado")
+
+    # Cache de resultados em logs/ (só para benchmarks que aceitam o parâmetro cache)
+    cache = None
+    if not args.no_cache and aceita_parametro(executar_benchmark, "cache"):
+        cache = ResultCache(CAMINHO_PADRAO)
+        if args.clear_cache:
+            for size in args.sizes:
+                for nome_agente in args.agentes:
+                    cache.invalidate(nome_agente, size)
+        benchmark_kwargs["cache"] = cache
+    # Limites de passos e de tempo por episódio (só para benchmarks que aceitam os parâmetros)
+    if aceita_parametro(executar_benchmark, "max_steps"):
+        benchmark_kwargs.update(max_steps=args.max_steps, timeout=args.timeout)
+    # Perfil de memória (só para benchmarks que aceitam os parâmetros; nos demais a opção é ignorada)
+    perfil_varredura = args.mem_profile > 0 and executar_varredura is not None and \
+        aceita_parametro(executar_varredura, "mem_profile") and aceita_parametro(executar_varredura, "mem_profile_root")
+    perfil_execucao = args.mem_profile > 0 and \
+        aceita_parametro(executar_benchmark, "mem_profile") and aceita_parametro(executar_benchmark, "mem_profile_dir")
+    if args.mem_profile > 0 and not (perfil_varredura if executar_varredura is not None else perfil_execucao):
+        print(f"⚠️ O benchmark '{args.benchmark}' não aceita perfil de memória: --mem-profile será ignorado")
 
     # === Criação do diretório de saída ===
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -141,13 +198,29 @@ def main():
         print(f"🚀 Iniciando benchmark em: {output_dir}")
         print(f"📊 Configuração: {args.execucoes} execuções, tamanhos {args.sizes}, agentes {args.agentes}\n")
 
+        resultados_varredura = {}
+        if executar_varredura is not None:
+            kwargs_varredura = dict(benchmark_kwargs)
+            if perfil_varredura:
+                kwargs_varredura.update(mem_profile=args.mem_profile, mem_profile_root=output_dir)
+            for resultado in executar_varredura(args.agentes, args.sizes, args.execucoes, **kwargs_varredura):
+                resultados_varredura[resultado["agente"], resultado["tamanho_mundo"]] = resultado
+
         for size in args.sizes:
             for nome_agente in args.agentes:
                 logger = Logger(nome_agente, output_dir)
                 logger.write(f"\n🚀 Iniciando benchmark: Agente = '{nome_agente}' | Mundo = {size}x{size}")
 
                 # ATENÇÃO: NÃO ALTERAR A SEÇÃO DE DADOS EXTRAS E GRÁFICOS AVANÇADOS
-                resultado = executar_benchmark(nome_agente, size, args.execucoes)
+                # Perfil de memória: relatórios ao lado dos advanced_charts_* desta execução
+                kwargs_execucao = dict(benchmark_kwargs)
+                if perfil_execucao:
+                    kwargs_execucao.update(mem_profile=args.mem_profile, mem_profile_dir=os.path.join(
+                        output_dir, f"memory_profile_{nome_agente}_{size}x{size}"))
+                if (nome_agente, size) in resultados_varredura:
+                    resultado = resultados_varredura[nome_agente, size]
+                else:
+                    resultado = executar_benchmark(nome_agente, size, args.execucoes, **kwargs_execucao)
                 resultados.append(resultado)
 
                 if resultado is None:
@@ -174,13 +247,19 @@ def main():
         for _, row in df_resultados.iterrows():
             agente = row['agente']
             tamanho = row['tamanho_mundo']
-            total = row['vitórias'] + row['mortes'] + row['sobreviveu']
+            tempo_esgotado = row.get('tempo_esgotado', 0)
+            total = row['vitórias'] + row['mortes'] + row['sobreviveu'] + tempo_esgotado
             print(f"\n📊 RESULTADOS - {agente.upper()} | Tamanho: {tamanho}x{tamanho}")
             print(f"🏆 Vitórias: {row['vitórias']} ({(row['vitórias']/total)*100:.1f}%)")
             print(f"☠️ Mortes: {row['mortes']} ({(row['mortes']/total)*100:.1f}%)")
             print(f"🤔 Sobreviveu sem vencer: {row['sobreviveu']} ({(row['sobreviveu']/total)*100:.1f}%)")
+            if tempo_esgotado:
+                print(f"⏰ Tempo esgotado: {tempo_esgotado} ({(tempo_esgotado/total)*100:.1f}%)")
             print(f"⏱️ Tempo total: {formatar_tempo(row['tempo_total'])} | Tempo médio: {formatar_tempo(row['tempo_médio'])}")
 
+    if cache is not None:
+        cache.close()
+
     # === Salvando a saída do terminal em arquivo .txt ===
     terminal_output_path = os.path.join(output_dir, "terminal_output.txt")
     with open(terminal_output_path, "w", encoding="utf-8") as f:
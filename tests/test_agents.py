@@ -0,0 +1,45 @@
+# ==============================
+# tests/test_agents.py
+# ==============================
+'''
+# Testes de regressão dos agentes baseados em conhecimento: episódios que antes ficavam
+# presos em laço até esgotar o orçamento de passos precisam terminar por vitória ou morte.
+'''
+
+import contextlib
+import io
+
+import pytest
+
+from world.world import World
+from agents.logic_agent import LogicAgent
+from agents.probabilistic_agent import ProbabilisticAgent
+from utils.watchdog import BudgetedWorld, episode_status, max_steps_for, STATUS_TEMPO_ESGOTADO
+
+
+def executar(agente_cls, size, seed):
+    # Roda um episódio com o orçamento padrão dos benchmarks, sem a saída no terminal
+    mundo = BudgetedWorld.wrap(World(size, seed=seed), max_steps_for(size))
+    agente = agente_cls(mundo)
+    with contextlib.redirect_stdout(io.StringIO()):
+        agente.run()
+    return mundo, agente
+
+
+def test_logic_agent_seed_0_termina_sem_esgotar_passos():
+    mundo, agente = executar(LogicAgent, 4, 0)
+    assert episode_status(mundo) != STATUS_TEMPO_ESGOTADO
+    # Toda célula visitada (em que o agente sobreviveu) é segura e passável pelo planejador
+    kb = agente.knowledge
+    assert kb.visitado & ~kb.seguro == 0
+    assert kb.visitado & ~kb.planner.seguro == 0
+
+
+@pytest.mark.parametrize("size, seed", [(4, 157), (6, 92), (6, 169), (8, 193)])
+def test_probabilistic_agent_termina_sem_esgotar_passos(size, seed):
+    mundo, agente = executar(ProbabilisticAgent, size, seed)
+    assert episode_status(mundo) != STATUS_TEMPO_ESGOTADO
+    # As restrições de brisa só podem citar células ainda não visitadas nem seguras
+    kb = agente.knowledge
+    for restricao in kb._restricoes_poco():
+        assert restricao & (kb.visitado | kb.seguro) == 0
@@ -0,0 +1,40 @@
+# ==============================
+# tests/test_cost_model.py
+# ==============================
+'''
+# Testes do histórico de tempos do CostModel: só as observações mais recentes de cada
+# (agente, tamanho, parâmetros) são mantidas e o arquivo não cresce indefinidamente.
+'''
+
+from utils import cost_model
+from utils.cost_model import CostModel
+
+
+def linhas(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_historico_limitado_por_agente_tamanho_e_parametros(tmp_path, monkeypatch):
+    monkeypatch.setattr(cost_model, "MAX_OBSERVACOES", 5)
+    caminho = str(tmp_path / "tempos.jsonl")
+    modelo = CostModel(caminho)
+    for i in range(100):
+        modelo.record("logico", 4, float(i))
+        modelo.record("logico", 6, 1000.0 + i)
+    # Nunca passa do dobro das observações mantidas (5 por tamanho)
+    assert len(linhas(caminho)) <= 2 * 2 * 5
+    # Um novo modelo lê só as mais recentes de cada tamanho
+    relido = CostModel(caminho)
+    assert relido.estimate("logico", 4) == 97.0
+    assert relido.estimate("logico", 6) == 1097.0
+
+
+def test_compact_preserva_registros_de_outras_instancias(tmp_path):
+    caminho = str(tmp_path / "tempos.jsonl")
+    a, b = CostModel(caminho), CostModel(caminho)
+    a.record("logico", 4, 1.0)
+    b.record("genetico", 4, 2.0)
+    a.compact()
+    assert len(linhas(caminho)) == 2
+    assert a.estimate("genetico", 4) == 2.0
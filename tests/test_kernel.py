@@ -0,0 +1,33 @@
+# ==============================
+# tests/test_kernel.py
+# ==============================
+'''
+# Testes de paridade das avaliações de fitness do GA: o kernel (ga/kernel.py) e a
+# avaliação vetorizada (ga/batch_eval.py) precisam dar o mesmo fitness que
+# Individual.evaluate para qualquer cromossomo.
+'''
+
+import random
+
+import numpy as np
+import pytest
+
+from world.world import World, ACAO_CODIGO
+from ga.batch_eval import batch_evaluate
+from ga.individual import Individual
+from ga.kernel import check_parity
+
+
+def test_kernel_igual_a_referencia():
+    assert check_parity(sizes=(4, 6), seeds=range(3), pop_size=16, chrom_length=40) == 2 * 3 * 16
+
+
+@pytest.mark.parametrize("size, seed", [(4, 0), (4, 7), (6, 3), (8, 5)])
+def test_batch_evaluate_igual_a_individual_evaluate(size, seed):
+    world = World(size, seed=seed)
+    rng = random.Random(seed)
+    individuos = [Individual(60, rng) for _ in range(32)]
+    for individuo in individuos:
+        individuo.evaluate(world)
+    codigos = np.array([[ACAO_CODIGO[g] for g in ind.chromosome] for ind in individuos], dtype=np.uint8)
+    assert batch_evaluate(codigos, world).tolist() == [ind.fitness for ind in individuos]
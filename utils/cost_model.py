@@ -0,0 +1,152 @@
+# ==============================
+# utils/cost_model.py
+# ==============================
+'''
+# Este módulo fornece a classe CostModel, que estima o tempo de uma execução dos
+# benchmarks a partir dos tempos observados em execuções anteriores. Cada execução
+# registra (agente, tamanho do mundo, parâmetros do agente, tempo) em um arquivo de
+# histórico (JSON Lines em logs/). A estimativa usa a mediana dos tempos do mesmo
+# tamanho ou, para tamanhos ainda não observados, uma lei de potência
+# tempo = a * tamanho^b ajustada por mínimos quadrados em escala log-log. Sem histórico,
+# usa tempos padrão por agente (mundo 4x4) escalados pela área do mundo.
+# Só as MAX_OBSERVACOES mais recentes de cada (agente, tamanho, parâmetros) são usadas;
+# quando o arquivo passa do dobro das observações mantidas, ele é reescrito só com elas.
+'''
+
+import heapq
+import json
+import math
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from utils.result_cache import params_key
+
+# Arquivo de histórico padrão e tempos usados enquanto não há observações (mundo 4x4)
+CAMINHO_PADRAO = os.path.join("logs", "tempos_execucao.jsonl")
+TEMPOS_PADRAO = {
+    'logico': 0.10,
+    'probabilistico': 0.10,
+    'genetico': 0.30
+}
+TAMANHO_REFERENCIA = 4
+# Observações mantidas por (agente, tamanho, parâmetros): as mais antigas são descartadas
+MAX_OBSERVACOES = 200
+
+
+class CostModel:
+    def __init__(self, path=CAMINHO_PADRAO):
+        """
+        :param path: Arquivo de histórico (None = apenas em memória)
+        """
+        self.path = path
+        # (agente, parâmetros) → lista de (tamanho, tempo), da mais antiga para a mais recente
+        self.observacoes = defaultdict(list)
+        self._mantidas = 0  # Observações em memória
+        self._linhas = 0  # Linhas do arquivo de histórico (inclui as observações descartadas)
+        if path and os.path.exists(path):
+            self._ler(path)
+            self._compactar_se_necessario()
+
+    def _ler(self, path):
+        with open(path, encoding="utf-8") as f:
+            for linha in f:
+                self._linhas += 1
+                try:
+                    registro = json.loads(linha)
+                    self._adicionar(registro["agente"], registro["tamanho"], registro["params"], registro["tempo"])
+                except (ValueError, KeyError):
+                    continue  # Linha incompleta (ex.: execução interrompida durante a escrita)
+
+    def _adicionar(self, agente, world_size, chave_params, tempo):
+        lista = self.observacoes[agente, chave_params]
+        lista.append((world_size, tempo))
+        mesmo_tamanho = [i for i, (tamanho, _) in enumerate(lista) if tamanho == world_size]
+        if len(mesmo_tamanho) > MAX_OBSERVACOES:
+            del lista[mesmo_tamanho[0]]
+        else:
+            self._mantidas += 1
+
+    @staticmethod
+    def _registro(agente, world_size, chave_params, tempo):
+        return json.dumps({"agente": agente, "tamanho": world_size, "params": chave_params, "tempo": tempo}) + "\n"
+
+    def _compactar_se_necessario(self):
+        # O arquivo só recebe novas linhas: reescrito quando passa do dobro das observações
+        # mantidas, ele fica limitado a 2 * MAX_OBSERVACOES linhas por (agente, tamanho, parâmetros)
+        if self._linhas > max(2 * self._mantidas, MAX_OBSERVACOES):
+            self.compact()
+
+    def compact(self):
+        """
+        Reescreve o arquivo de histórico apenas com as MAX_OBSERVACOES observações mais
+        recentes de cada agente, tamanho e parâmetros. O arquivo é relido antes (inclui os
+        tempos gravados por outras instâncias) e a memória passa a refletir o novo conteúdo.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        recente = CostModel(None)
+        recente._ler(self.path)
+        temporario = self.path + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            for (agente, chave), lista in recente.observacoes.items():
+                for tamanho, tempo in lista:
+                    f.write(self._registro(agente, tamanho, chave, tempo))
+        os.replace(temporario, self.path)  # Troca atômica: o histórico nunca fica pela metade
+        self.observacoes, self._mantidas, self._linhas = recente.observacoes, recente._mantidas, recente._mantidas
+
+    def record(self, agente, world_size, tempo, params=None):
+        """
+        Registra o tempo observado de uma execução (em memória e no arquivo de histórico).
+        """
+        chave = params_key(params)
+        self._adicionar(agente, world_size, chave, tempo)
+        if self.path:
+            pasta = os.path.dirname(self.path)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(self._registro(agente, world_size, chave, tempo))
+            self._linhas += 1
+            self._compactar_se_necessario()
+
+    def estimate(self, agente, world_size, params=None):
+        """
+        Tempo esperado (segundos) de uma execução. Usa as observações com os mesmos
+        parâmetros; se não houver, as do agente com quaisquer parâmetros.
+        """
+        observacoes = self.observacoes.get((agente, params_key(params)))
+        if not observacoes:
+            observacoes = [o for (nome, _), lista in self.observacoes.items() if nome == agente for o in lista]
+        if not observacoes:
+            return TEMPOS_PADRAO.get(agente, 0.2) * (world_size / TAMANHO_REFERENCIA) ** 2
+
+        # Mediana por tamanho (robusta a execuções atípicas)
+        por_tamanho = defaultdict(list)
+        for tamanho, tempo in observacoes:
+            por_tamanho[tamanho].append(tempo)
+        medianas = {tamanho: float(np.median(tempos)) for tamanho, tempos in por_tamanho.items()}
+        if world_size in medianas:
+            return medianas[world_size]
+        tamanhos = sorted(medianas)
+        if len(tamanhos) == 1:
+            # Um único tamanho observado: escala pela área do mundo
+            return medianas[tamanhos[0]] * (world_size / tamanhos[0]) ** 2
+        # Lei de potência ajustada em escala log-log
+        x = np.log(tamanhos)
+        y = np.log([max(medianas[t], 1e-6) for t in tamanhos])
+        b, a = np.polyfit(x, y, 1)
+        return float(math.exp(a + b * math.log(world_size)))
+
+    @staticmethod
+    def makespan(custos, n_workers):
+        """
+        Tempo total estimado para executar as tarefas em n_workers processos, enviando
+        as mais longas primeiro para o worker que ficar livre antes.
+        :param custos: Tempo esperado de cada tarefa
+        """
+        livres = [0.0] * max(1, n_workers)
+        for custo in sorted(custos, reverse=True):
+            heapq.heappush(livres, heapq.heappop(livres) + custo)
+        return max(livres)
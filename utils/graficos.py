@@ -5,7 +5,7 @@
 # Este módulo centraliza todas as funções de geração de gráficos do projeto Wumpus World.
 # Ele inclui funções para criar gráficos básicos (barras, tempo médio) e avançados
 # (memória/CPU, evolução do fitness, convergência, violino, ECDF, mapas de calor,
-# área empilhada e PCA) a partir dos dados coletados nos benchmarks dos agentes.
+# área empilhada, PCA e tempo por fase do GA) a partir dos dados coletados nos benchmarks dos agentes.
 # Todos os gráficos são salvos automaticamente nas pastas de saída organizadas por execução.
 '''
 
@@ -83,10 +83,12 @@ def gerar_graficos_avancados(dados_extra, output_dir):
     # 3. Comportamento de Convergência da População (mínimo, médio e máximo de fitness)
     if 'fitness_pop' in dados_extra:
         fitness_pop = np.array(dados_extra['fitness_pop'])  # shape: (gerações, população)
+        # Com histórico limitado em RAM, as linhas são gerações amostradas
+        geracoes_pop = dados_extra.get('fitness_pop_geracoes') or list(range(len(fitness_pop)))
         plt.figure(figsize=(8,5))
-        plt.plot(np.min(fitness_pop, axis=1), label='Mínimo')
-        plt.plot(np.mean(fitness_pop, axis=1), label='Médio')
-        plt.plot(np.max(fitness_pop, axis=1), label='Máximo')
+        plt.plot(geracoes_pop, np.min(fitness_pop, axis=1), label='Mínimo')
+        plt.plot(geracoes_pop, np.mean(fitness_pop, axis=1), label='Médio')
+        plt.plot(geracoes_pop, np.max(fitness_pop, axis=1), label='Máximo')
         plt.title('Comportamento de Convergência da População')
         plt.xlabel('Geração')
         plt.ylabel('Fitness')
@@ -100,8 +102,8 @@ def gerar_graficos_avancados(dados_extra, output_dir):
         mean = np.mean(fitness_pop, axis=1)
         std = np.std(fitness_pop, axis=1)
         plt.figure(figsize=(8,5))
-        plt.plot(mean, label='Média')
-        plt.fill_between(range(len(mean)), mean-std, mean+std, alpha=0.3, label='Desvio Padrão')
+        plt.plot(geracoes_pop, mean, label='Média')
+        plt.fill_between(geracoes_pop, mean-std, mean+std, alpha=0.3, label='Desvio Padrão')
         plt.title('Média das Curvas de Convergência com Desvio Padrão')
         plt.xlabel('Geração')
         plt.ylabel('Fitness')
@@ -131,10 +133,19 @@ def gerar_graficos_avancados(dados_extra, output_dir):
         plt.savefig(os.path.join(output_dir, "ecdf_fitness_final.png"))
         plt.close()
 
+    # A diversidade pode ser amostrada (a cada k gerações) ou desativada no GA
+    diversidade = dados_extra.get('diversidade_vars')
+    tem_diversidade = diversidade is not None and len(diversidade) > 0
+    if tem_diversidade:
+        diversidade = np.asarray(diversidade)
+        geracoes = dados_extra.get('diversidade_geracoes') or list(range(diversidade.shape[0]))
+
     # 7. Mapa de Calor da Diversidade por Variável ao longo das gerações
-    if 'diversidade_vars' in dados_extra:
+    if tem_diversidade:
         plt.figure(figsize=(10,6))
-        sns.heatmap(dados_extra['diversidade_vars'], cmap='viridis')
+        ax = sns.heatmap(diversidade, cmap='viridis')
+        # Rótulos das linhas com o número real da geração de cada amostra
+        ax.set_yticklabels([geracoes[int(t)] for t in ax.get_yticks()])
         plt.title('Mapa de Calor da Diversidade por Variável')
         plt.xlabel('Variável')
         plt.ylabel('Geração')
@@ -143,11 +154,10 @@ def gerar_graficos_avancados(dados_extra, output_dir):
         plt.close()
 
     # 8. Gráfico de Área Empilhada da Diversidade por Variável
-    if 'diversidade_vars' in dados_extra:
+    if tem_diversidade:
         plt.figure(figsize=(10,6))
-        # Cada linha de diversidade_vars é uma geração, cada coluna uma variável
-        plt.stackplot(range(dados_extra['diversidade_vars'].shape[0]), 
-                      dados_extra['diversidade_vars'].T)
+        # Cada linha de diversidade_vars é uma geração amostrada, cada coluna uma variável
+        plt.stackplot(geracoes, diversidade.T)
         plt.title('Área Empilhada da Diversidade por Variável')
         plt.xlabel('Geração')
         plt.ylabel('Diversidade')
@@ -167,3 +177,21 @@ def gerar_graficos_avancados(dados_extra, output_dir):
         plt.tight_layout()
         plt.savefig(os.path.join(output_dir, "pca_populacao_final.png"))
         plt.close()
+
+    # 10. Tempo por fase de cada geração e avaliações por segundo (GA com profile_phases)
+    tempos = dados_extra.get('tempos')
+    if isinstance(tempos, dict) and tempos.get('avaliacao'):
+        fases = ['avaliacao', 'ordenacao', 'diversidade', 'selecao', 'cruzamento', 'mutacao', 'log']
+        geracoes = range(len(tempos['avaliacao']))
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10,8), sharex=True)
+        ax1.stackplot(geracoes, [np.array(tempos[f]) * 1000 for f in fases], labels=fases)
+        ax1.set_title('Tempo por Fase em cada Geração')
+        ax1.set_ylabel('Tempo (ms)')
+        ax1.legend(loc='upper right', fontsize='small')
+        ax2.plot(geracoes, tempos['avaliacoes_por_segundo'])
+        ax2.set_title('Avaliações de Fitness por Segundo')
+        ax2.set_xlabel('Geração')
+        ax2.set_ylabel('Avaliações/s')
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, "tempos_fases.png"))
+        plt.close()
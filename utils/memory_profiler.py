@@ -0,0 +1,157 @@
+# ==============================
+# utils/memory_profiler.py
+# ==============================
+'''
+# Este módulo fornece a classe MemoryProfiler, um modo opcional de perfil de memória
+# baseado em tracemalloc. Diferente do RSS do processo (psutil), o tracemalloc atribui
+# cada alocação à linha de código que a fez, permitindo identificar o que cresce ao
+# longo de uma execução (cópias de mundo, deepcopy de indivíduos, históricos do GA).
+# São tiradas snapshots em pontos escolhidos (ex.: a cada k gerações), registrados os
+# maiores pontos de alocação e o pico de memória rastreada, e ao final é gravado um
+# relatório com a diferença entre a primeira e a última snapshot.
+'''
+
+import os
+import tracemalloc
+
+# Arquivos ignorados nas snapshots (o próprio rastreamento e o mecanismo de importação)
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _local(frame):
+    # Caminho relativo ao diretório atual (quando possível) + linha
+    try:
+        caminho = os.path.relpath(frame.filename)
+    except ValueError:
+        caminho = frame.filename
+    return f"{caminho}:{frame.lineno}"
+
+
+class MemoryProfiler:
+    def __init__(self, report_path=None, top=10, frames=1):
+        """
+        :param report_path: Arquivo de texto onde o relatório é gravado em finish() (opcional)
+        :param top: Quantidade de pontos de alocação listados em cada amostra
+        :param frames: Profundidade da pilha guardada pelo tracemalloc em cada alocação
+        """
+        self.report_path = report_path
+        self.top = top
+        self.frames = frames
+        self.amostras = []
+        self._iniciou = False
+        self._inicial = None
+        self._anterior = None
+
+    def start(self):
+        # Liga o tracemalloc (se ainda não estiver ligado) e tira a snapshot inicial
+        self._iniciou = not tracemalloc.is_tracing()
+        if self._iniciou:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._inicial = self._anterior = self._snapshot()
+
+    def sample(self, rotulo):
+        """
+        Tira uma snapshot e registra memória atual, pico, maiores alocações e o
+        crescimento desde a amostra anterior.
+        :param rotulo: Identificação da amostra (ex.: 'geração 10')
+        """
+        snapshot = self._snapshot()
+        atual, pico = tracemalloc.get_traced_memory()
+        self.amostras.append({
+            "rotulo": rotulo,
+            "atual_kb": atual / 1024,
+            "pico_kb": pico / 1024,
+            "top": self._estatisticas(snapshot.statistics('lineno')),
+            "crescimento": self._estatisticas(snapshot.compare_to(self._anterior, 'lineno')),
+        })
+        self._anterior = snapshot
+
+    def finish(self):
+        """
+        Compara a última snapshot com a inicial, grava o relatório e desliga o
+        tracemalloc (se foi ligado por este perfil).
+        :return: Dicionário com amostras, pico e maiores crescimentos
+        """
+        final = self._snapshot()
+        _, pico = tracemalloc.get_traced_memory()
+        diferenca = self._estatisticas(final.compare_to(self._inicial, 'lineno'))
+        if self._iniciou:
+            tracemalloc.stop()
+        resumo = {
+            "pico_kb": pico / 1024,
+            "amostras": self.amostras,
+            "crescimento_total": diferenca,
+            "relatorio": self.report_path,
+        }
+        if self.report_path:
+            self.write_report(resumo)
+        return resumo
+
+    def write_report(self, resumo):
+        # Relatório em texto: evolução da memória, crescimento total e por intervalo
+        pasta = os.path.dirname(self.report_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        linhas = [
+            "Perfil de memória (tracemalloc)",
+            f"Pico de memória rastreada: {resumo['pico_kb']:.1f} KB",
+            "",
+            "Memória rastreada por amostra:",
+        ]
+        linhas += [f"  {a['rotulo']}: atual = {a['atual_kb']:.1f} KB | pico = {a['pico_kb']:.1f} KB"
+                   for a in resumo["amostras"]]
+        linhas += ["", "Maior crescimento entre o início e o fim:"]
+        linhas += [self._formatar(e) for e in resumo["crescimento_total"]]
+        if resumo["amostras"]:
+            ultima = resumo["amostras"][-1]
+            linhas += ["", f"Maiores alocações vivas ({ultima['rotulo']}):"]
+            linhas += [self._formatar(e) for e in ultima["top"]]
+        linhas += ["", "Crescimento desde a amostra anterior:"]
+        for a in resumo["amostras"]:
+            linhas.append(f"  [{a['rotulo']}]")
+            linhas += ["  " + self._formatar(e) for e in a["crescimento"][:5]]
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(linhas) + "\n")
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_FILTROS)
+
+    def _estatisticas(self, estatisticas):
+        # Converte Statistic/StatisticDiff do tracemalloc em dicionários simples
+        resultado = []
+        for e in estatisticas[:self.top]:
+            item = {"local": _local(e.traceback[0]), "tamanho_kb": e.size / 1024, "blocos": e.count}
+            if isinstance(e, tracemalloc.StatisticDiff):
+                item["diferenca_kb"] = e.size_diff / 1024
+                item["diferenca_blocos"] = e.count_diff
+            resultado.append(item)
+        return resultado
+
+    @staticmethod
+    def _formatar(item):
+        if "diferenca_kb" in item:
+            return (f"  {item['diferenca_kb']:+10.1f} KB ({item['diferenca_blocos']:+d} blocos) "
+                    f"{item['local']} | total {item['tamanho_kb']:.1f} KB")
+        return f"  {item['tamanho_kb']:10.1f} KB ({item['blocos']} blocos) {item['local']}"
+
+
+def profile_run(funcao, report_path, top=10):
+    """
+    Executa funcao() com o perfil de memória ligado e grava o relatório em report_path.
+    Usado para agentes sem gerações (ex.: o agente lógico), com uma única amostra ao final.
+    :return: Retorno de funcao()
+    """
+    profiler = MemoryProfiler(report_path, top)
+    profiler.start()
+    try:
+        return funcao()
+    finally:
+        profiler.sample("fim")
+        profiler.finish()
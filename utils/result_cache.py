@@ -0,0 +1,132 @@
+# ==============================
+# utils/result_cache.py
+# ==============================
+'''
+# Este módulo fornece a classe ResultCache, um cache local (SQLite) dos resultados de
+# execuções dos benchmarks. Com a semente do mundo e os parâmetros do agente fixos, uma
+# execução é determinística; por isso o resultado (status, tempo e dados extras) é
+# guardado com a chave (agente, tamanho do mundo, semente, parâmetros, versão do código)
+# e reaproveitado nas varreduras seguintes. A versão do código é um hash dos arquivos
+# dos agentes, do GA, do mundo, de utils/watchdog.py e dos benchmarks que executam os
+# episódios (benchmark.py e benchmark_fast.py): qualquer alteração neles invalida as
+# entradas antigas.
+'''
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+
+# Caminho padrão do cache e pastas/arquivos cujo código influencia o resultado de uma execução
+CAMINHO_PADRAO = os.path.join("logs", "resultados_cache.sqlite")
+PASTAS_CODIGO = ("agents", "ga", "world")
+ARQUIVOS_CODIGO = (os.path.join("utils", "watchdog.py"), "benchmark.py", "benchmark_fast.py")
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@functools.lru_cache(maxsize=1)
+def code_version():
+    """
+    Hash do código-fonte dos agentes, do GA, do mundo, do limite de episódios (watchdog)
+    e dos benchmarks que usam o cache (como cada execução é montada e medida).
+    :return: String hexadecimal (16 caracteres)
+    """
+    h = hashlib.sha1()
+    for pasta in PASTAS_CODIGO:
+        for raiz, subpastas, arquivos in os.walk(os.path.join(_RAIZ, pasta)):
+            subpastas.sort()
+            for nome in sorted(arquivos):
+                if nome.endswith(".py"):
+                    caminho = os.path.join(raiz, nome)
+                    h.update(os.path.relpath(caminho, _RAIZ).encode("utf-8"))
+                    with open(caminho, "rb") as f:
+                        h.update(f.read())
+    for arquivo in ARQUIVOS_CODIGO:
+        h.update(arquivo.encode("utf-8"))
+        with open(os.path.join(_RAIZ, arquivo), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def params_key(params):
+    # Parâmetros do agente em JSON canônico (valores não serializáveis viram repr)
+    return json.dumps(params or {}, sort_keys=True, default=repr)
+
+
+class ResultCache:
+    def __init__(self, path=CAMINHO_PADRAO):
+        """
+        :param path: Arquivo SQLite do cache (a pasta é criada se não existir)
+        """
+        self.path = path
+        pasta = os.path.dirname(path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.conexao = sqlite3.connect(path)
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " agente TEXT, tamanho INTEGER, semente INTEGER, params TEXT, versao TEXT,"
+            " status TEXT, tempo REAL, dados_extra BLOB,"
+            " PRIMARY KEY (agente, tamanho, semente, params, versao))"
+        )
+        self.conexao.commit()
+        self.versao = code_version()
+        self.acertos = 0
+        self.faltas = 0
+
+    def get(self, agente, world_size, seed, params=None):
+        """
+        Resultado guardado de uma execução.
+        :return: Dicionário {status, tempo, dados_extra} ou None se não houver
+        """
+        linha = self.conexao.execute(
+            "SELECT status, tempo, dados_extra FROM resultados"
+            " WHERE agente = ? AND tamanho = ? AND semente = ? AND params = ? AND versao = ?",
+            (agente, world_size, seed, params_key(params), self.versao)
+        ).fetchone()
+        if linha is None:
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        status, tempo, dados_extra = linha
+        return {"status": status, "tempo": tempo, "dados_extra": pickle.loads(dados_extra)}
+
+    def put(self, agente, world_size, seed, params, resultado):
+        """
+        Guarda o resultado de uma execução (substitui o anterior de mesma chave).
+        :param resultado: Dicionário {status, tempo, dados_extra}
+        """
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (agente, world_size, seed, params_key(params), self.versao, resultado["status"],
+             resultado["tempo"], pickle.dumps(resultado.get("dados_extra"), protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        self.conexao.commit()
+
+    def invalidate(self, agente=None, world_size=None, stale_only=False):
+        """
+        Remove entradas do cache.
+        :param agente: Remove apenas as deste agente (None = todos)
+        :param world_size: Remove apenas as deste tamanho de mundo (None = todos)
+        :param stale_only: Remove apenas as gravadas por outra versão do código
+        :return: Número de entradas removidas
+        """
+        condicoes, valores = [], []
+        if agente is not None:
+            condicoes.append("agente = ?")
+            valores.append(agente)
+        if world_size is not None:
+            condicoes.append("tamanho = ?")
+            valores.append(world_size)
+        if stale_only:
+            condicoes.append("versao != ?")
+            valores.append(self.versao)
+        where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+        removidas = self.conexao.execute("DELETE FROM resultados" + where, valores).rowcount
+        self.conexao.commit()
+        return removidas
+
+    def close(self):
+        self.conexao.close()
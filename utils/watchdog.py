@@ -0,0 +1,132 @@
+# ==============================
+# utils/watchdog.py
+# ==============================
+'''
+# Este módulo limita a duração de um episódio de qualquer agente nos benchmarks.
+# BudgetedWorld é um World com orçamento de passos e prazo (tempo de relógio): ao
+# esgotá-los, is_done() passa a retornar True (agentes que repetem "enquanto o jogo
+# não termina" encerram normalmente) e novos passos levantam EpisodeTimeout.
+# time_limit() interrompe com EpisodeTimeout, via SIGALRM, um trecho que não executa
+# passos no mundo (ex.: a evolução do GA ou um laço dentro de decide()). Execuções
+# interrompidas recebem o status STATUS_TEMPO_ESGOTADO nos resultados.
+'''
+
+import contextlib
+import signal
+import threading
+import time
+
+from world.world import World
+
+# Status de uma execução interrompida pelo limite de passos ou de tempo
+STATUS_TEMPO_ESGOTADO = "tempo_esgotado"
+# Limite padrão de passos por episódio nos benchmarks, por célula do mundo (20 * size * size)
+PASSOS_POR_CELULA = 20
+
+
+class EpisodeTimeout(Exception):
+    """O episódio excedeu o limite de passos ou de tempo."""
+
+
+class BudgetedWorld(World):
+    __slots__ = ('max_steps', 'deadline', 'steps', 'timed_out')
+
+    @classmethod
+    def wrap(cls, world, max_steps=None, timeout=None):
+        """
+        Cria um mundo com orçamento a partir do layout e do estado de outro mundo.
+        :param world: Mundo original
+        :param max_steps: Número máximo de passos do episódio (None = sem limite)
+        :param timeout: Tempo máximo do episódio em segundos, contado a partir daqui (None = sem limite)
+        :return: Novo BudgetedWorld
+        """
+        episodio = cls.from_layout(world.layout, world.snapshot(), world.rng)
+        episodio.max_steps = max_steps
+        episodio.deadline = time.perf_counter() + timeout if timeout else None
+        episodio.steps = 0
+        episodio.timed_out = False
+        return episodio
+
+    def step(self, action):
+        if self.timed_out:
+            raise EpisodeTimeout(f"Episódio encerrado após {self.steps} passos")
+        resultado = World.step(self, action)
+        self.steps += 1
+        if (self.max_steps is not None and self.steps >= self.max_steps) or \
+                (self.deadline is not None and time.perf_counter() >= self.deadline):
+            self.timed_out = True
+        return resultado
+
+    def is_done(self):
+        return self.timed_out or World.is_done(self)
+
+
+def episode_status(world, interrompido=False):
+    """
+    Status de uma execução nos resultados dos benchmarks.
+    :param interrompido: Se a execução foi interrompida por EpisodeTimeout
+    :return: 'vitória', 'morte', 'tempo_esgotado' ou 'sobreviveu'
+    """
+    if world.won:
+        return "vitória"
+    if not world.is_alive:
+        return "morte"
+    if interrompido or getattr(world, "timed_out", False):
+        return STATUS_TEMPO_ESGOTADO
+    return "sobreviveu"
+
+
+@contextlib.contextmanager
+def time_limit(timeout):
+    """
+    Levanta EpisodeTimeout se o bloco durar mais que timeout segundos.
+    Usa SIGALRM, disponível apenas na thread principal de sistemas Unix; fora dela
+    (ou com timeout None) o bloco roda sem limite e vale apenas o prazo do BudgetedWorld.
+    """
+    if not timeout or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def estourou(signum, frame):
+        raise EpisodeTimeout(f"Tempo limite de {timeout}s excedido")
+
+    anterior = signal.signal(signal.SIGALRM, estourou)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, anterior)
+
+
+def max_steps_for(world_size, max_steps=None):
+    """
+    Limite de passos efetivo de um episódio em um mundo world_size x world_size.
+    :param max_steps: Limite pedido (None = padrão PASSOS_POR_CELULA * world_size², 0 = sem limite)
+    :return: Número máximo de passos ou None (sem limite)
+    """
+    if max_steps is None:
+        return PASSOS_POR_CELULA * world_size * world_size
+    return max_steps or None
+
+
+def run_episode(agente_cls, world, max_steps=None, timeout=None, **agente_kwargs):
+    """
+    Executa um episódio de um agente com limite de passos e de tempo.
+    :param agente_cls: Classe do agente (recebe o mundo e agente_kwargs)
+    :param world: Mundo do episódio (o agente joga em uma cópia com orçamento)
+    :param max_steps: Número máximo de passos (None = padrão proporcional ao mundo, 0 = sem limite; ver max_steps_for)
+    :param timeout: Tempo máximo em segundos (None = sem limite)
+    :return: (mundo do episódio, retorno de run() ou None se interrompido, status)
+    """
+    mundo = BudgetedWorld.wrap(world, max_steps_for(world.size, max_steps), timeout)
+    agente = agente_cls(mundo, **agente_kwargs)
+    if hasattr(agente, "logger"):
+        agente.logger = None  # desativa logging para não poluir a saída
+    interrompido = False
+    try:
+        with time_limit(timeout):
+            resultado = agente.run()
+    except EpisodeTimeout:
+        resultado, interrompido = None, True
+    return mundo, resultado, episode_status(mundo, interrompido)
@@ -6,43 +6,191 @@
 # do Wumpus World. O ambiente inclui o agente, o ouro, o Wumpus e os poços, além das regras
 # de movimentação, percepções e interações. Fornece métodos para executar ações, simular
 # percepções, verificar condições de vitória/morte e clonar o estado do mundo para simulações
-# do algoritmo genético e testes dos agentes inteligentes do projeto.
+# do algoritmo genético e testes dos agentes inteligentes do projeto. A parte fixa do mundo
+# (WorldLayout) é compartilhada entre clones; só o estado do episódio é copiado.
 '''
 
 import random
-import copy
+
+# Ações codificadas como inteiros (mesma ordem usada no ACTION_MAP do GeneticAgent)
+ACOES = ['CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO']
+CIMA, BAIXO, ESQUERDA, DIREITA, AGARRAR, TIRO = range(len(ACOES))
+ACAO_CODIGO = {acao: i for i, acao in enumerate(ACOES)}
+
+# Percepções codificadas como bits de uma máscara inteira
+FEDOR, BRISA, BRILHO = 1, 2, 4
+# Tabela máscara → lista de percepções (índice = máscara de 0 a 7)
+MASCARA_PERCEPCOES = [
+    [nome for bit, nome in ((FEDOR, 'FEDOR'), (BRISA, 'BRISA'), (BRILHO, 'BRILHO')) if mascara & bit]
+    for mascara in range(8)
+]
+
+# Status codificados como inteiros (índice em STATUS_NOMES)
+STATUS_OK, STATUS_MORTO, STATUS_GANHOU = range(3)
+STATUS_NOMES = ('OK', 'MORTO', 'GANHOU')
+
+class WorldLayout:
+    """
+    Parte imutável do mundo: tamanho, ouro, Wumpus, poços e tabelas de percepção.
+    É compartilhada por referência entre todos os clones de um World.
+    """
+    __slots__ = ('size', 'gold_pos', 'wumpus_pos', 'pits', 'pit_set',
+                 'percept_grid_vivo', 'percept_grid_morto')
+
+    def __init__(self, size, gold_pos, wumpus_pos, pits):
+        self.size = size
+        self.gold_pos = gold_pos
+        self.wumpus_pos = wumpus_pos
+        self.pits = tuple(pits)
+        self.pit_set = frozenset(self.pits)  # Conjunto de poços para busca O(1)
+        # Tabelas de percepção pré-computadas com o Wumpus vivo e morto
+        self.percept_grid_vivo = self._build_percept_grid(wumpus_alive=True)
+        self.percept_grid_morto = self._build_percept_grid(wumpus_alive=False)
+
+    def fingerprint(self):
+        """
+        Identificação do layout (tamanho, ouro, Wumpus e poços) para uso como chave de cache.
+        :return: Tupla imutável e comparável
+        """
+        return (self.size, self.gold_pos, self.wumpus_pos, tuple(sorted(self.pit_set)))
+
+    def _build_percept_grid(self, wumpus_alive):
+        """
+        Pré-computa a máscara de percepções (FEDOR | BRISA | BRILHO) de cada célula.
+        :param wumpus_alive: Se o FEDOR do Wumpus deve ser considerado
+        :return: Tupla de tuplas indexada por [x][y]
+        """
+        grid = []
+        for x in range(self.size):
+            linha = []
+            for y in range(self.size):
+                mascara = 0
+                for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+                    vizinho = (x + dx, y + dy)
+                    if vizinho == self.wumpus_pos and wumpus_alive:
+                        mascara |= FEDOR
+                    if vizinho in self.pit_set:
+                        mascara |= BRISA
+                if (x, y) == self.gold_pos:
+                    mascara |= BRILHO
+                linha.append(mascara)
+            grid.append(tuple(linha))
+        return tuple(grid)
 
 class World:
-    def __init__(self, size, seed=None):
+    # Apenas o estado mutável do episódio fica na instância; o resto está em self.layout
+    __slots__ = ('layout', 'rng', 'agent_pos', 'is_alive', 'wumpus_alive', 'last_scream', 'won')
+
+    def __init__(self, size, seed=None, rng=None):
         """
         Inicializa o mundo do Wumpus.
         :param size: Tamanho do mundo (quadrado size x size)
         :param seed: Semente para geração aleatória (opcional)
+        :param rng: Gerador random.Random próprio (opcional, tem prioridade sobre seed)
         """
-        self.size = size
-        if seed is not None:
-            random.seed(seed)  # Define a semente para resultados reproduzíveis
-        
+        # Gerador próprio do mundo: não altera o estado do módulo random global.
+        # random.Random(seed) produz a mesma sequência que random.seed(seed), então
+        # os mundos gerados para uma semente continuam os mesmos.
+        self.rng = rng if rng is not None else random.Random(seed)
+
         # Elementos do mundo
-        self.agent_pos = (0, 0)  # Posição inicial do agente
-        self.gold_pos = self.random_pos(exclude=[self.agent_pos])  # Posição do ouro
-        self.wumpus_pos = self.random_pos(exclude=[self.agent_pos, self.gold_pos])  # Posição do Wumpus
+        agent_pos = (0, 0)  # Posição inicial do agente
+        gold_pos = self.random_pos(exclude=[agent_pos], size=size)  # Posição do ouro
+        wumpus_pos = self.random_pos(exclude=[agent_pos, gold_pos], size=size)  # Posição do Wumpus
         # Lista de posições dos poços, evitando sobreposição com agente, ouro e Wumpus
-        self.pits = [self.random_pos(exclude=[self.agent_pos, self.gold_pos, self.wumpus_pos]) for _ in range(size // 2)]
+        pits = [self.random_pos(exclude=[agent_pos, gold_pos, wumpus_pos], size=size) for _ in range(size // 2)]
+        self.layout = WorldLayout(size, gold_pos, wumpus_pos, pits)
+        self._reset_state()
+
+    @classmethod
+    def generate_many(cls, size, seeds):
+        """
+        Gera vários mundos de uma vez, cada um com seu próprio gerador.
+        O resultado para cada semente independe da ordem e da thread/processo de criação.
+        :param size: Tamanho dos mundos
+        :param seeds: Iterável de sementes
+        :return: Lista de objetos World, na mesma ordem das sementes
+        """
+        return [cls(size, seed=seed) for seed in seeds]
 
+    @classmethod
+    def from_layout(cls, layout, state=None, rng=None):
+        """
+        Cria um mundo a partir de um layout existente, sem sortear posições.
+        :param layout: WorldLayout compartilhado
+        :param state: Snapshot opcional (ver snapshot()); se omitido, começa do estado inicial
+        :param rng: Gerador random.Random próprio (opcional)
+        :return: Novo objeto World
+        """
+        world = cls.__new__(cls)
+        world.layout = layout
+        world.rng = rng if rng is not None else random.Random()
+        if state is None:
+            world._reset_state()
+        else:
+            world.restore(state)
+        return world
+
+    def _reset_state(self):
+        self.agent_pos = (0, 0)      # Posição inicial do agente
         self.is_alive = True         # Estado de vida do agente
         self.wumpus_alive = True     # Estado de vida do Wumpus
         self.last_scream = False     # Indica se o último tiro matou o Wumpus
         self.won = False             # Indica se o agente venceu
 
-    def random_pos(self, exclude=[]):
+    # Acesso aos elementos fixos do mundo (delegado ao layout)
+    @property
+    def size(self):
+        return self.layout.size
+
+    @property
+    def gold_pos(self):
+        return self.layout.gold_pos
+
+    @property
+    def wumpus_pos(self):
+        return self.layout.wumpus_pos
+
+    @property
+    def pits(self):
+        return self.layout.pits
+
+    @property
+    def pit_set(self):
+        return self.layout.pit_set
+
+    @property
+    def percept_grid(self):
+        """Tabela de percepções válida para o estado atual do Wumpus."""
+        if self.wumpus_alive:
+            return self.layout.percept_grid_vivo
+        return self.layout.percept_grid_morto
+
+    def snapshot(self):
+        """
+        Captura o estado mutável do episódio.
+        :return: Tupla (agent_pos, is_alive, wumpus_alive, won, last_scream)
+        """
+        return (self.agent_pos, self.is_alive, self.wumpus_alive, self.won, self.last_scream)
+
+    def restore(self, state):
+        """
+        Restaura um estado capturado por snapshot().
+        :param state: Tupla retornada por snapshot()
+        """
+        self.agent_pos, self.is_alive, self.wumpus_alive, self.won, self.last_scream = state
+
+    def random_pos(self, exclude=[], size=None):
         """
         Gera uma posição aleatória no mundo, excluindo as posições fornecidas.
         :param exclude: Lista de posições a serem evitadas
+        :param size: Tamanho do mundo (usado durante a construção, antes do layout existir)
         :return: Tupla (x, y) com a posição sorteada
         """
+        if size is None:
+            size = self.size
         while True:
-            pos = (random.randint(0, self.size - 1), random.randint(0, self.size - 1))
+            pos = (self.rng.randint(0, size - 1), self.rng.randint(0, size - 1))
             if pos not in exclude:
                 return pos
 
@@ -52,23 +200,39 @@ class World:
             :param action: Ação a ser executada ('CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA', 'AGARRAR', 'TIRO')
             :return: (percepção, status) onde status pode ser 'OK', 'MORTO' ou 'GANHOU'
         """
+        mascara, status = self.step_fast(ACAO_CODIGO.get(action, -1))
+        return MASCARA_PERCEPCOES[mascara][:], STATUS_NOMES[status]
+
+    def step_fast(self, action):
+        """
+            Versão inteira de step(), usada nos laços de simulação do algoritmo genético.
+            :param action: Código inteiro da ação (CIMA, BAIXO, ESQUERDA, DIREITA, AGARRAR, TIRO)
+            :return: (máscara de percepção, código de status STATUS_OK/STATUS_MORTO/STATUS_GANHOU)
+        """
         self.last_scream = False  # Reset do grito
-        self.move_agent(action)   # Movimento separado
-        status = self.interact(action)  # Interações separadas
-        return self.perceive(), status
+        self._move_code(action)
+        status = self._interact_code(action)
+        x, y = self.agent_pos
+        if self.wumpus_alive:
+            return self.layout.percept_grid_vivo[x][y], status
+        return self.layout.percept_grid_morto[x][y], status
 
     def move_agent(self, action):
         """
         Move o agente no grid se a ação for de movimento.
         """
+        self._move_code(ACAO_CODIGO.get(action, -1))
+
+    def _move_code(self, action):
         x, y = self.agent_pos
-        if action == 'CIMA' and x > 0:
+        limite = self.layout.size - 1
+        if action == CIMA and x > 0:
             self.agent_pos = (x - 1, y)
-        elif action == 'BAIXO' and x < self.size - 1:
+        elif action == BAIXO and x < limite:
             self.agent_pos = (x + 1, y)
-        elif action == 'ESQUERDA' and y > 0:
+        elif action == ESQUERDA and y > 0:
             self.agent_pos = (x, y - 1)
-        elif action == 'DIREITA' and y < self.size - 1:
+        elif action == DIREITA and y < limite:
             self.agent_pos = (x, y + 1)
 
     def interact(self, action):
@@ -76,32 +240,36 @@ class World:
         Aplica os efeitos da ação (pegar ouro, atirar, morrer etc.).
         :return: status final da jogada
         """
+        return STATUS_NOMES[self._interact_code(ACAO_CODIGO.get(action, -1))]
+
+    def _interact_code(self, action):
+        layout = self.layout
         # Ouro
-        if action == 'AGARRAR' and self.agent_pos == self.gold_pos:
+        if action == AGARRAR and self.agent_pos == layout.gold_pos:
             self.won = True
-            return 'GANHOU'
+            return STATUS_GANHOU
 
-        # Tiro no Wumpus
-        if action == 'TIRO':
-            if self.is_adjacent(self.agent_pos, self.wumpus_pos) and self.wumpus_alive:
+        # Tiro no Wumpus (a tabela de percepções passa a ser a do Wumpus morto)
+        if action == TIRO:
+            if self.wumpus_alive and self.is_adjacent(self.agent_pos, layout.wumpus_pos):
                 self.wumpus_alive = False
                 self.last_scream = True
 
         # Morte por Wumpus
-        if self.agent_pos == self.wumpus_pos and self.wumpus_alive:
+        if self.agent_pos == layout.wumpus_pos and self.wumpus_alive:
             self.is_alive = False
-            return 'MORTO'
+            return STATUS_MORTO
 
         # Morte por poço
-        if self.agent_pos in self.pits:
+        if self.agent_pos in layout.pit_set:
             self.is_alive = False
-            return 'MORTO'
+            return STATUS_MORTO
 
         # Vitória
         if self.won:
-            return 'GANHOU'
+            return STATUS_GANHOU
 
-        return 'OK'
+        return STATUS_OK
 
 
     def perceive(self):
@@ -109,23 +277,14 @@ class World:
         Retorna as percepções do agente na posição atual.
         :return: Lista de percepções ('FEDOR', 'BRISA', 'BRILHO')
         """
-        percept = []
-        x, y = self.agent_pos
+        return MASCARA_PERCEPCOES[self.perceive_mask()][:]
 
-        # Verifica células adjacentes para FEDOR (Wumpus) e BRISA (poço)
-        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                if (nx, ny) == self.wumpus_pos and self.wumpus_alive:
-                    percept.append('FEDOR')
-                if (nx, ny) in self.pits:
-                    percept.append('BRISA')
-
-        # Verifica se está sobre o ouro
-        if self.agent_pos == self.gold_pos:
-            percept.append('BRILHO')
-
-        return percept
+    def perceive_mask(self):
+        """
+        Retorna as percepções da posição atual como máscara de bits (FEDOR | BRISA | BRILHO).
+        """
+        x, y = self.agent_pos
+        return self.percept_grid[x][y]
 
     def is_done(self):
         """
@@ -136,10 +295,19 @@ class World:
 
     def clone(self):
         """
-        Retorna uma cópia profunda do mundo (útil para simulações).
+        Retorna uma cópia do mundo (útil para simulações).
+        Apenas o estado do episódio é copiado; o layout é compartilhado por referência.
         :return: Novo objeto World idêntico ao atual
         """
-        return copy.deepcopy(self)
+        world = World.__new__(World)
+        world.layout = self.layout
+        world.rng = self.rng
+        world.agent_pos = self.agent_pos
+        world.is_alive = self.is_alive
+        world.wumpus_alive = self.wumpus_alive
+        world.last_scream = self.last_scream
+        world.won = self.won
+        return world
 
     def is_adjacent(self, pos1, pos2):
         """